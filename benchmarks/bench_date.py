@@ -0,0 +1,75 @@
+import argparse
+import dataclasses
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from benchmarks.common import measure
+from src.data import Date
+
+
+@dataclasses.dataclass(slots=True)
+class EagerDate:
+    dt: datetime
+    long: str
+    short: str
+    colvir: str
+
+    @classmethod
+    def create(cls, dt: datetime) -> "EagerDate":
+        return cls(
+            dt=dt,
+            long=dt.strftime("%d.%m.%Y"),
+            short=dt.strftime("%d.%m.%y"),
+            colvir=dt.strftime("%d%m%y"),
+        )
+
+    def as_dict(self) -> Dict[str, str]:
+        return {
+            "dt": self.dt.isoformat(),
+            "long": self.dt.strftime("%d.%m.%Y"),
+            "short": self.dt.strftime("%d.%m.%y"),
+            "colvir": self.dt.strftime("%d%m%y"),
+        }
+
+
+def generate_datetimes(size: int, unique_days: int) -> List[datetime]:
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    return [start + timedelta(days=rng.randrange(unique_days)) for _ in range(size)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--unique-days", type=int, default=60)
+    args = parser.parse_args()
+
+    values = generate_datetimes(size=args.size, unique_days=args.unique_days)
+    print(f"size={args.size}, unique_days={args.unique_days}")
+
+    measure(
+        "construct: EagerDate.create", lambda: [EagerDate.create(v) for v in values]
+    )
+    measure("construct: Date", lambda: [Date(v) for v in values])
+    measure("construct: Date.from_values", lambda: Date.from_values(values))
+
+    eager_dates = [EagerDate.create(v) for v in values]
+    dates = Date.from_values(values)
+
+    measure("format: EagerDate.short", lambda: [d.short for d in eager_dates])
+    measure("format: Date.short", lambda: [d.short for d in dates])
+
+    measure(
+        "serialize: EagerDate.as_dict + json.dumps",
+        lambda: json.dumps([d.as_dict() for d in eager_dates]),
+    )
+    measure(
+        "serialize: Date.as_dict + json.dumps",
+        lambda: json.dumps([d.as_dict() for d in dates]),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import measure
+from src.utils.dialog_utils import DialogInspector, parse_dialog_content
+
+DIALOG_TITLE = "Colvir Banking System"
+CLIPBOARD_TEXT = (
+    "[Window Title]\r\nColvir Banking System\r\n"
+    "[Content]\r\nНе найдено структурное подразделение\r\n[OK]\r\n"
+)
+
+
+class SimulatedDesktop:
+    """Stand-in for the Colvir windows with latencies of the real calls."""
+
+    def __init__(self, scale: float) -> None:
+        self.scale = scale
+        self.windows: Dict[str, int] = {}
+        self.win32_controls: Dict[int, List[Tuple[str, str]]] = {}
+        self.uia_controls: Dict[int, List[Tuple[str, str]]] = {}
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds * self.scale)
+
+    def show_dialog(self) -> None:
+        # A TaskDialog: the text and buttons are drawn inside a DirectUIHWND,
+        # so EnumChildWindows sees no Static controls, only UI Automation does
+        self.windows[DIALOG_TITLE] = 1
+        self.win32_controls[1] = [
+            ("DirectUIHWND", ""),
+            ("CtrlNotifySink", ""),
+            ("Button", "OK"),
+        ]
+        self.uia_controls[1] = [
+            ("Pane", ""),
+            ("Text", "Не найдено структурное подразделение"),
+            ("Button", "OK"),
+        ]
+
+    def find_window(self, title: str) -> int:
+        self.sleep(0.0001)
+        return self.windows.get(title, 0)
+
+    def enumerate_windows(self, title: str) -> bool:
+        # pywinauto WindowSpecification.exists() re-enumerates top-level windows
+        # and keeps polling for Timings.exists_timeout when nothing matches
+        self.sleep(0.02)
+        if title not in self.windows:
+            self.sleep(0.5)
+            return False
+        return True
+
+    def read_win32_controls(self, handle: int) -> List[Tuple[str, str]]:
+        self.sleep(0.0005)
+        return self.win32_controls[handle]
+
+    def read_uia_controls(self, handle: int) -> List[Tuple[str, str]]:
+        # A cached UIAElementInfo.descendants() walk over a small dialog
+        self.sleep(0.03)
+        return self.uia_controls[handle]
+
+    def read_clipboard(self, handle: int) -> str:
+        self.sleep(0.5)
+        self.sleep(0.5)
+        return CLIPBOARD_TEXT
+
+
+def legacy_dialog_text(desktop: SimulatedDesktop) -> Optional[str]:
+    if not desktop.enumerate_windows(DIALOG_TITLE):
+        return None
+    return parse_dialog_content(desktop.read_clipboard(1)).content
+
+
+def inspector_dialog_text(inspector: DialogInspector) -> Optional[str]:
+    inspection = inspector.inspect()
+    if inspection is None:
+        return None
+    return inspection[1].content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=0.1,
+        help="Multiplier applied to the simulated GUI latencies",
+    )
+    args = parser.parse_args()
+    print(f"scale={args.scale}")
+
+    desktop = SimulatedDesktop(scale=args.scale)
+    inspectors = {
+        backend: DialogInspector(
+            title=DIALOG_TITLE,
+            find_window=desktop.find_window,
+            read_controls=read_controls,
+            read_clipboard=desktop.read_clipboard,
+        )
+        for backend, read_controls in (
+            ("win32", desktop.read_win32_controls),
+            ("uia", desktop.read_uia_controls),
+        )
+    }
+
+    measure("no dialog: legacy", lambda: legacy_dialog_text(desktop), repeat=3)
+    for backend, inspector in inspectors.items():
+        measure(
+            f"no dialog: inspector ({backend})",
+            lambda: inspector_dialog_text(inspector),
+            repeat=3,
+        )
+
+    desktop.show_dialog()
+    measure("dialog: legacy", lambda: legacy_dialog_text(desktop), repeat=3)
+    for backend, inspector in inspectors.items():
+        assert inspector_dialog_text(inspector) == legacy_dialog_text(desktop)
+        measure(
+            f"dialog: inspector ({backend})",
+            lambda: inspector_dialog_text(inspector),
+            repeat=3,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from benchmarks.common import measure
+from src.data import BusinessTripOrder, Date
+from src.serialization import dumps_orders, get_serializer, loads_orders
+
+
+def legacy_as_dict(order: BusinessTripOrder) -> Dict[str, Any]:
+    return {
+        "employee_fullname": order.employee_fullname,
+        "employee_names": order.employee_names,
+        "order_number": order.order_number,
+        "sign_date": order.sign_date.as_dict(),
+        "start_date": order.start_date.as_dict(),
+        "end_date": order.end_date.as_dict(),
+        "trip_place": order.trip_place,
+        "trip_code": order.trip_code,
+        "trip_reason": order.trip_reason,
+        "main_order_number": order.main_order_number,
+        "main_order_start_date": order.main_order_start_date.as_dict(),
+        "deputy_fullname": order.deputy_fullname,
+        "deputy_names": order.deputy_names,
+    }
+
+
+def legacy_as_dict_short(order: BusinessTripOrder) -> Dict[str, Any]:
+    return {
+        "employee_fullname": order.employee_fullname,
+        "order_number": order.order_number,
+        "sign_date": order.sign_date.short,
+        "start_date": order.start_date.short,
+        "end_date": order.end_date.short,
+        "trip_place": order.trip_place,
+        "trip_code": order.trip_code,
+        "trip_reason": order.trip_reason,
+        "main_order_number": order.main_order_number,
+        "main_order_start_date": order.main_order_start_date.short,
+        "deputy_fullname": order.deputy_fullname,
+    }
+
+
+def generate_orders(size: int) -> List[BusinessTripOrder]:
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+
+    orders = []
+    for i in range(size):
+        start_date = Date(start + timedelta(days=rng.randrange(60)))
+        orders.append(
+            BusinessTripOrder(
+                employee_fullname=f"Иванов Иван Иванович {i}",
+                employee_names=("Иванов", "Иван"),
+                order_number=str(1000 + i),
+                sign_date=start_date,
+                start_date=start_date,
+                end_date=Date(start_date.dt + timedelta(days=rng.randrange(1, 10))),
+                trip_place="город Астана",
+                trip_code="AST",
+                trip_reason="Участие в совещании",
+                main_order_number=str(i),
+                main_order_start_date=start_date,
+                deputy_fullname=None,
+                deputy_names=None,
+            )
+        )
+    return orders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    orders = generate_orders(size=args.size)
+    serializer = get_serializer(BusinessTripOrder)
+    print(f"size={args.size}")
+
+    measure(
+        "dump: legacy as_dict + json.dumps(indent=2)",
+        lambda: json.dumps(
+            [legacy_as_dict(order) for order in orders], ensure_ascii=False, indent=2
+        ),
+    )
+    measure("dump: dumps_orders", lambda: dumps_orders(orders))
+
+    measure(
+        "to_md: legacy as_dict_short + json.dumps(indent=2)",
+        lambda: [
+            json.dumps(legacy_as_dict_short(order), indent=2, ensure_ascii=False)
+            for order in orders
+        ],
+    )
+    measure(
+        "to_md: serializer.dumps_short",
+        lambda: [serializer.dumps_short(order) for order in orders],
+    )
+
+    text = dumps_orders(orders)
+    measure("load: loads_orders", lambda: loads_orders(BusinessTripOrder, text))
+
+
+if __name__ == "__main__":
+    main()
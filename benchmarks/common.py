@@ -0,0 +1,28 @@
+import time
+import tracemalloc
+from typing import Any, Callable
+
+
+def measure(
+    name: str, func: Callable[[], Any], number: int = 1, repeat: int = 5
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start_time) / number)
+
+    best = min(timings)
+    print(f"{name:<60} {best * 1000:10.3f} ms")
+    return best
+
+
+def measure_peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
@@ -0,0 +1,446 @@
+import argparse
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.generators import CITIES, ROW_GENERATORS, generate_csv
+from src import bpm, process_manager
+from src.data import Order, Process, ProcessType
+from src.employee_cache import EmployeeCache
+from src.metrics import metrics
+from src.notification import TelegramAPI
+
+DEFAULT_LATENCIES = {
+    "startup": 20.0,
+    "order_status": 8.0,
+    "employee_card": 6.0,
+    "create_entry": 12.0,
+    "confirm_entry": 5.0,
+    "post_dialog": 4.0,
+}
+POST_DIALOG_TYPES = {ProcessType.BUSINESS_TRIP}
+
+
+class BpmStubHandler(BaseHTTPRequestHandler):
+    server: "BpmStub"
+
+    def do_GET(self) -> None:
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        report_id = query.get("gid" if query.get("s") == ["obj_a"] else "id", [""])[0]
+        content = self.server.reports.get(report_id)
+        self.server.requests += 1
+        if content is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class BpmStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, reports: Dict[ProcessType, str]) -> None:
+        super().__init__(("127.0.0.1", 0), BpmStubHandler)
+        self.reports = {
+            str(process_type.value): content.encode("utf-8")
+            for process_type, content in reports.items()
+        }
+        self.requests = 0
+
+
+class TelegramStubHandler(BaseHTTPRequestHandler):
+    server: "TelegramStub"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.messages += 1
+
+        content = b'{"ok": true, "result": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class TelegramStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), TelegramStubHandler)
+        self.messages = 0
+
+
+class SmtpSinkHandler(socketserver.StreamRequestHandler):
+    server: "SmtpSink"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self) -> None:
+        self.reply("220 localhost SMTP sink")
+        while line := self.rfile.readline():
+            command = line.decode("ascii", errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                    size += len(data_line)
+                self.server.messages.append(size)
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), SmtpSinkHandler)
+        self.messages: List[int] = []
+
+
+@contextmanager
+def serve(server: socketserver.BaseServer) -> Iterator[int]:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class SimColvir:
+    """Colvir backend that only waits the configured latency of every step."""
+
+    is_thread_safe = True
+
+    def __init__(self, latencies: Dict[str, float], scale: float) -> None:
+        self.latencies = latencies
+        self.scale = scale
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.first_order_at: Optional[float] = None
+
+    def act(self, step: str) -> None:
+        time.sleep(self.latencies.get(step, 0.0) * self.scale)
+
+    def __enter__(self) -> "SimColvir":
+        self.act("startup")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def reset_state(self) -> Optional[str]:
+        return None
+
+    def process_order(self, colvir: Any, process: Process, order: Order) -> str:
+        steps = ["order_status", "employee_card", "create_entry", "confirm_entry"]
+        if process.process_type in POST_DIALOG_TYPES:
+            steps.append("post_dialog")
+
+        for step in steps:
+            with metrics.timer("colvir_step_seconds", step=step):
+                self.act(step)
+
+        with self.lock:
+            self.processed += 1
+            if self.first_order_at is None:
+                self.first_order_at = time.perf_counter()
+        return "Приказ создан"
+
+
+class StubDownloader(bpm.ReportDownloader):
+    """Fetches the BPM report URLs directly instead of through Chrome."""
+
+    def __init__(self) -> None:
+        pass
+
+    def set_download_folder(self, download_folder: str) -> None:
+        pass
+
+    def __call__(self, process: Process) -> bool:
+        try:
+            with urllib.request.urlopen(process.download_url, timeout=30) as response:
+                content = response.read()
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                return False
+            raise
+
+        with open(process.csv_path, "wb") as f:
+            f.write(content)
+        return True
+
+
+class SimEnvironment(process_manager.RunEnvironment):
+    def __init__(
+        self,
+        data_folder: str,
+        colvir: SimColvir,
+        strategy: process_manager.ScheduleStrategy,
+    ) -> None:
+        super().__init__(data_folder=data_folder)
+        self.colvir = colvir
+        self.strategy = strategy
+
+    @contextmanager
+    def open_bpm(self, bpm_info: bpm.BpmInfo) -> Iterator[bpm.ReportDownloader]:
+        yield StubDownloader()
+
+    def open_colvir(self, employee_cache: EmployeeCache, resident: bool) -> SimColvir:
+        return self.colvir
+
+    def prepare_colvir(
+        self, colvir: Any, jobs: List[process_manager.Job], bot: TelegramAPI
+    ) -> List[process_manager.Job]:
+        return jobs
+
+    def get_processor(
+        self, process_type: ProcessType
+    ) -> process_manager.ProcessCallable:
+        return self.colvir.process_order
+
+
+def load_day(day_folder: str) -> Dict[ProcessType, str]:
+    reports: Dict[ProcessType, str] = {}
+    for process_type in ProcessType:
+        csv_path = os.path.join(day_folder, f"{process_type.name.lower()}.csv")
+        if os.path.exists(csv_path):
+            with open(csv_path, "r", encoding="utf-8") as f:
+                reports[process_type] = f.read()
+    return reports
+
+
+def generate_day(size: int) -> Dict[ProcessType, str]:
+    return {
+        process_type: generate_csv(process_type=process_type, size=size)
+        for process_type in ROW_GENERATORS
+    }
+
+
+def load_cities(day_folder: Optional[str]) -> Dict[str, str]:
+    cities_path = os.path.join(day_folder or "", "cities.json")
+    if day_folder and os.path.exists(cities_path):
+        with open(cities_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {city: f"{city[:3].upper()}.{city}" for city in CITIES}
+
+
+def get_phases() -> Dict[str, Tuple[float, int]]:
+    phases: Dict[str, Tuple[float, int]] = {}
+    with metrics.lock:
+        for (name, labels), histogram in metrics.histograms.items():
+            if name == "stage_seconds":
+                continue
+            phase = name.removesuffix("_seconds")
+            step = dict(labels).get("step")
+            if step:
+                phase = f"{phase}:{step}"
+            total, count = phases.get(phase, (0.0, 0))
+            phases[phase] = (total + histogram.total, count + histogram.count)
+    return phases
+
+
+def run_strategy(
+    strategy_name: str,
+    day: datetime,
+    cities: Dict[str, str],
+    latencies: Dict[str, float],
+    scale: float,
+    smtp_sink: SmtpSink,
+    telegram_stub: TelegramStub,
+) -> Dict[str, Any]:
+    metrics.reset()
+    smtp_sink.messages.clear()
+    telegram_stub.messages = 0
+    colvir = SimColvir(latencies=latencies, scale=scale)
+
+    with tempfile.TemporaryDirectory() as data_folder:
+        os.makedirs(os.path.join(data_folder, "reports"))
+        with open(
+            os.path.join(data_folder, "reports", "cities.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(cities, f, ensure_ascii=False)
+
+        start_time = time.perf_counter()
+        process_manager.run(
+            bot=TelegramAPI(),
+            full_resync=True,
+            start_date=day,
+            end_date=day,
+            environment=SimEnvironment(
+                data_folder=data_folder,
+                colvir=colvir,
+                strategy=process_manager.ScheduleStrategy(strategy_name),
+            ),
+        )
+        wall_time = time.perf_counter() - start_time
+
+    first_order_time = (
+        colvir.first_order_at - start_time if colvir.first_order_at else None
+    )
+    return {
+        "strategy": strategy_name,
+        "orders": colvir.processed,
+        "wall_seconds": wall_time,
+        "orders_per_hour": colvir.processed / wall_time * 3600 if wall_time else 0.0,
+        "first_order_seconds": first_order_time,
+        "emails": len(smtp_sink.messages),
+        "telegram_messages": telegram_stub.messages,
+        "phases": {
+            phase: {"seconds": total, "count": count}
+            for phase, (total, count) in sorted(get_phases().items())
+        },
+    }
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        first_order = result["first_order_seconds"]
+        print(
+            f"\n{result['strategy']}: {result['orders']} orders in "
+            f"{result['wall_seconds']:.2f}s, {result['orders_per_hour']:.0f} orders/h, "
+            f"first order after "
+            f"{'-' if first_order is None else f'{first_order:.2f}s'}, "
+            f"{result['emails']} emails, {result['telegram_messages']} messages"
+        )
+        for phase, values in result["phases"].items():
+            print(f"  {phase:<40} {values['seconds']:10.3f} s {values['count']:8}")
+
+
+def parse_latency(value: str) -> Tuple[str, float]:
+    step, _, seconds = value.partition("=")
+    if step not in DEFAULT_LATENCIES or not seconds:
+        raise argparse.ArgumentTypeError(
+            f"Expected STEP=SECONDS with STEP in {list(DEFAULT_LATENCIES)}"
+        )
+    return step, float(seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--day-folder",
+        default=None,
+        help="Recorded BPM reports, <process_type>.csv and optionally cities.json",
+    )
+    parser.add_argument(
+        "--date",
+        type=lambda value: datetime.strptime(value, "%d.%m.%Y"),
+        default=datetime(2024, 7, 1),
+        help="Day (dd.mm.yyyy) the run is replayed for",
+    )
+    parser.add_argument(
+        "--orders",
+        type=int,
+        default=10,
+        help="Orders per process type in a generated day, without --day-folder",
+    )
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=["sequential", "batched", "parallel"],
+        default=["sequential", "batched", "parallel"],
+    )
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        action="append",
+        default=[],
+        metavar="STEP=SECONDS",
+        help="Override a simulated Colvir step latency",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=0.01,
+        help="Multiplier applied to the simulated Colvir latencies",
+    )
+    parser.add_argument("--json", default=None, help="Write the results to a file")
+    args = parser.parse_args()
+
+    if args.day_folder:
+        reports = load_day(args.day_folder)
+    else:
+        reports = generate_day(args.orders)
+    latencies = {**DEFAULT_LATENCIES, **dict(args.latency)}
+
+    bpm_stub = BpmStub(reports=reports)
+    smtp_sink = SmtpSink()
+    telegram_stub = TelegramStub()
+    with (
+        serve(bpm_stub) as bpm_port,
+        serve(smtp_sink) as smtp_port,
+        serve(telegram_stub) as telegram_port,
+    ):
+        os.environ.update(
+            {
+                "BPM_BASE_URL": f"http://127.0.0.1:{bpm_port}/",
+                "BPM_USER": "robot",
+                "BPM_PASSWORD": "robot",
+                "DRIVER_PATH": "chromedriver",
+                "CHROME_PATH": "chrome",
+                "COLVIR_PATH": "colvir",
+                "COLVIR_USER": "robot",
+                "COLVIR_PASSWORD": "robot",
+                "SMTP_SERVER": "127.0.0.1",
+                "SMTP_PORT": str(smtp_port),
+                "SMTP_SENDER": "robot@localhost",
+                "SMTP_RECIPIENTS": "hr@localhost",
+                "TOKEN": "e2e",
+                "CHAT_ID": "0",
+                "TELEGRAM_API_URL": f"http://127.0.0.1:{telegram_port}/",
+            }
+        )
+
+        results = [
+            run_strategy(
+                strategy_name=strategy_name,
+                day=args.date,
+                cities=load_cities(args.day_folder),
+                latencies=latencies,
+                scale=args.scale,
+                smtp_sink=smtp_sink,
+                telegram_stub=telegram_stub,
+            )
+            for strategy_name in args.strategies
+        ]
+
+    print(f"Simulated Colvir latencies x{args.scale}: {latencies}")
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from src.data import Process, ProcessType
+
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Ахметов", "Касымов", "Ким", "Нурланов"]
+FIRST_NAMES = ["Иван", "Петр", "Айдар", "Ержан", "Сергей", "Алия", "Дана"]
+MIDDLE_NAMES = ["Иванович", "Петрович", "Серикович", "Маратович", ""]
+CITIES = ["Алматы", "Астана", "Шымкент", "Караганда", "Актобе", "Атырау"]
+VACATION_TYPES = [
+    "Ежегодный оплачиваемый трудовой отпуск",
+    "Учебный отпуск",
+    "Отпуск без сохранения заработной платы",
+]
+ORDER_TYPES = [
+    "Приказ о отправке работника в командировку",
+    "Приказ о предоставлении отпуска",
+    "Приказ об увольнении",
+]
+
+
+def random_name(rng: random.Random) -> str:
+    return " ".join(
+        filter(
+            None,
+            [
+                rng.choice(LAST_NAMES),
+                rng.choice(FIRST_NAMES),
+                rng.choice(MIDDLE_NAMES),
+            ],
+        )
+    )
+
+
+def random_date(rng: random.Random, start: datetime = datetime(2024, 1, 1)) -> str:
+    return (start + timedelta(days=rng.randrange(365))).strftime("%d.%m.%Y")
+
+
+def random_period(rng: random.Random, max_days: int = 30) -> Tuple[str, str]:
+    start_date = datetime.strptime(random_date(rng), "%d.%m.%Y")
+    end_date = start_date + timedelta(days=rng.randrange(max_days))
+    return start_date.strftime("%d.%m.%Y"), end_date.strftime("%d.%m.%Y")
+
+
+def business_trip_row(rng: random.Random, idx: int) -> Dict[str, str]:
+    start_date, end_date = random_period(rng)
+    return {
+        "Имя сотрудника": random_name(rng),
+        "Номер приказа": f"{1000 + idx}-к",
+        "Дата подписания": random_date(rng),
+        "Дата начала": start_date,
+        "Дата окончания": end_date,
+        "Место командирования": f"город {rng.choice(CITIES)}, Казахстан",
+        "Цель командировки": "Участие в рабочей встрече с представителями филиала",
+        "Номер основного приказа": f"{500 + idx}-к",
+        "Дата начала основного приказа": random_date(rng),
+        "Имя замещающего сотрудника": random_name(rng) if rng.random() < 0.3 else "",
+    }
+
+
+def vacation_row(rng: random.Random, idx: int) -> Dict[str, str]:
+    start_date, end_date = random_period(rng)
+    return {
+        "Имя сотрудника": random_name(rng),
+        "Тип приказа": rng.choice(VACATION_TYPES),
+        "Дата начала": start_date,
+        "Дата окончания": end_date,
+        "Номер приказа": f"{2000 + idx}-о",
+        "Имя замещающего": random_name(rng) if rng.random() < 0.3 else "",
+        "Доплата": "50%" if rng.random() < 0.3 else "",
+        "Начало замещения": random_date(rng),
+        "Конец замещения": random_date(rng),
+    }
+
+
+def vacation_withdraw_row(rng: random.Random, idx: int) -> Dict[str, str]:
+    return {
+        "Имя сотрудника": random_name(rng),
+        "Дата отзыва": random_date(rng),
+        "Тип приказа": "Отзыв из отпуска",
+        "Номер приказа": f"{3000 + idx}-о",
+    }
+
+
+def firing_row(rng: random.Random, idx: int) -> Dict[str, str]:
+    return {
+        "Имя сотрудника": random_name(rng),
+        "Дата увольнения": random_date(rng),
+        "Причина увольнения": "По собственному желанию",
+        "Номер приказа": f"{4000 + idx}-у",
+        "Компенсация": "Да" if rng.random() < 0.5 else "Нет",
+    }
+
+
+def mentorship_row(rng: random.Random, idx: int) -> Dict[str, str]:
+    mentorship_start_date, mentorship_end_date = random_period(rng, max_days=90)
+    return {
+        "Имя сотрудника": random_name(rng),
+        "ИИН": f"{rng.randrange(10**11, 10**12)}",
+        "Первый рабочий день": random_date(rng),
+        "Начало договора": random_date(rng),
+        "Окончание договора": random_date(rng),
+        "ФИО ментора": random_name(rng),
+        "Номер приказа о менторстве": f"{5000 + idx}-м",
+        "Начало менторства": mentorship_start_date,
+        "Окончание менторства": mentorship_end_date,
+        "Дата создания": f"{random_date(rng)} 10:15:00",
+    }
+
+
+ROW_GENERATORS: Dict[ProcessType, Callable[[random.Random, int], Dict[str, str]]] = {
+    ProcessType.BUSINESS_TRIP: business_trip_row,
+    ProcessType.VACATION: vacation_row,
+    ProcessType.VACATION_WITHDRAW: vacation_withdraw_row,
+    ProcessType.FIRING: firing_row,
+    ProcessType.MENTORSHIP: mentorship_row,
+}
+
+
+def generate_csv(process_type: ProcessType, size: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    rows = [ROW_GENERATORS[process_type](rng, idx) for idx in range(size)]
+
+    fieldnames = list(ROW_GENERATORS[process_type](random.Random(0), 0))
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, delimiter=";")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def make_process(root_folder: str, process_type: ProcessType, size: int) -> Process:
+    process_type_name = process_type.name.lower()
+    report_folder = os.path.join(
+        root_folder, "reports", "2024", "July", process_type_name
+    )
+    download_folder = os.path.join(root_folder, "downloads", process_type_name)
+    os.makedirs(report_folder, exist_ok=True)
+    os.makedirs(download_folder, exist_ok=True)
+
+    cities_path = os.path.join(root_folder, "reports", "cities.json")
+    with open(cities_path, "w", encoding="utf-8") as f:
+        json.dump({city: f"{city[:3].upper()}.{city}" for city in CITIES}, f)
+
+    csv_path = os.path.join(download_folder, f"{process_type_name}_{size}.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(generate_csv(process_type=process_type, size=size))
+
+    return Process(
+        process_type=process_type,
+        process_name=process_type_name,
+        order_type=ORDER_TYPES[0],
+        download_url="",
+        csv_path=csv_path,
+        report_folder=report_folder,
+        pickle_path=os.path.join(report_folder, f"{process_type_name}_{size}.pkl"),
+        report_path=os.path.join(report_folder, f"report_{size}.xlsx"),
+        today="01.07.24",
+    )
+
+
+def generate_order_export(path: str, size: int, seed: int = 42) -> List[str]:
+    import pandas as pd
+
+    rng = random.Random(seed)
+    order_numbers = [f"{1000 + idx}-к" for idx in range(size)]
+    df = pd.DataFrame(
+        {
+            "Вид приказа": [rng.choice(ORDER_TYPES) for _ in range(size)],
+            "Номер приказа": order_numbers,
+            "Дата приказа": [random_date(rng) for _ in range(size)],
+            "Статус": ["Исполнен"] * size,
+        }
+    )
+    df.to_excel(path, index=False, startrow=1)
+    return order_numbers
+
+
+def generate_dialog_texts(size: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        "\r\n".join(
+            [
+                "[Window Title]",
+                "Colvir Banking System",
+                "",
+                "[Content]",
+                f"Не найден табельный номер {rng.randrange(10000):04d}",
+                "",
+                "[OK]",
+                "",
+            ]
+        )
+        for _ in range(size)
+    ]
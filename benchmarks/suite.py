@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.common import measure, measure_peak_memory
+from benchmarks.generators import (
+    ROW_GENERATORS,
+    generate_dialog_texts,
+    generate_order_export,
+    make_process,
+)
+from src.data import ProcessType
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+# update_reports grows faster than linearly (22 s at 10k rows), at 100k the suite
+# runs longer than 30 minutes, so that size is only run on request with --sizes
+DEFAULT_SIZES = [10, 100, 1_000, 10_000]
+# differences below these are noise on millisecond-scale cases
+MIN_DELTAS = {"time_ms": 5.0, "peak_kb": 64.0}
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[str, int], Callable[[], Any]]
+
+
+class Result(NamedTuple):
+    time_ms: float
+    peak_kb: float
+
+
+def setup_convert_to_dataclass(process_type: ProcessType) -> Callable:
+    def setup(work_folder: str, size: int) -> Callable[[], Any]:
+        from src import bpm
+
+        process = make_process(work_folder, process_type=process_type, size=size)
+        return lambda: bpm.convert_to_dataclass(process=process, is_empty=False)
+
+    return setup
+
+
+def setup_update_reports(work_folder: str, size: int) -> Callable[[], Any]:
+    from src import bpm
+    from src.utils.utils import create_report, update_reports
+
+    process = make_process(work_folder, ProcessType.VACATION, size=size)
+    bpm.convert_to_dataclass(process=process, is_empty=False)
+    with open(process.pickle_path, "rb") as f:
+        orders = pickle.load(f)
+    results = [(order, "Создание приказа", "Приказ создан") for order in orders]
+
+    def run() -> None:
+        if os.path.exists(process.report_path):
+            os.remove(process.report_path)
+        create_report(process.report_path)
+        update_reports(process=process, results=results)
+
+    return run
+
+
+def setup_to_md(work_folder: str, size: int) -> Callable[[], Any]:
+    from benchmarks.bench_serialization import generate_orders
+    from src.notification import TelegramAPI
+
+    orders = generate_orders(size)
+    return lambda: [TelegramAPI.to_md(order) for order in orders]
+
+
+def setup_does_order_exist(work_folder: str, size: int) -> Callable[[], Any]:
+    from src.utils.order_export import does_order_exist
+
+    export_path = os.path.join(work_folder, f"orders_{size}.xlsx")
+    order_numbers = generate_order_export(export_path, size=size)
+    return lambda: does_order_exist(
+        orders_file_path=export_path,
+        order_type="Приказ об увольнении",
+        order_number=order_numbers[-1],
+    )
+
+
+def setup_parse_dialog_content(work_folder: str, size: int) -> Callable[[], Any]:
+    from src.utils.dialog_utils import parse_dialog_content
+
+    dialog_texts = generate_dialog_texts(size)
+    return lambda: [parse_dialog_content(text) for text in dialog_texts]
+
+
+CASES: List[Case] = [
+    Case(
+        f"convert_to_dataclass.{process_type.name.lower()}",
+        setup_convert_to_dataclass(process_type),
+    )
+    for process_type in ROW_GENERATORS
+] + [
+    Case("update_reports", setup_update_reports),
+    Case("to_md", setup_to_md),
+    Case("does_order_exist", setup_does_order_exist),
+    Case("parse_dialog_content", setup_parse_dialog_content),
+]
+
+
+def run_case(case: Case, size: int, repeat: int) -> Optional[Result]:
+    with tempfile.TemporaryDirectory() as work_folder:
+        try:
+            func = case.setup(work_folder, size)
+        except ImportError as error:
+            print(f"{case.name}[{size}] skipped: {error}")
+            return None
+
+        best = measure(f"{case.name}[{size}]", func, repeat=repeat)
+        peak = measure_peak_memory(func)
+    return Result(time_ms=best * 1000, peak_kb=peak / 1024)
+
+
+def load_baselines() -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(BASELINES_PATH):
+        return {}
+    with open(BASELINES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(baselines: Dict[str, Dict[str, float]]) -> None:
+    with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def find_regressions(
+    key: str, result: Result, baseline: Dict[str, float], threshold: float
+) -> List[str]:
+    regressions = []
+    for metric, value in result._asdict().items():
+        base_value = baseline.get(metric)
+        if not base_value or value - base_value < MIN_DELTAS[metric]:
+            continue
+        if value > base_value * (1 + threshold):
+            regressions.append(
+                f"{key} {metric}: {value:.3f} vs baseline {base_value:.3f} "
+                f"(+{(value / base_value - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--only", nargs="+", default=None, help="Case name prefixes to run"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or memory growth over the baseline, 0.25 = 25%%",
+    )
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="Store the measured results as the new baselines",
+    )
+    args = parser.parse_args()
+
+    cases = [
+        case
+        for case in CASES
+        if args.only is None or any(case.name.startswith(p) for p in args.only)
+    ]
+
+    baselines = load_baselines()
+    regressions: List[str] = []
+    for case in cases:
+        for size in args.sizes:
+            result = run_case(case, size=size, repeat=args.repeat)
+            if result is None:
+                continue
+
+            key = f"{case.name}[{size}]"
+            print(f"{'':<60} {result.peak_kb:10.1f} KiB peak")
+            if args.update_baselines:
+                baselines[key] = {
+                    "time_ms": round(result.time_ms, 3),
+                    "peak_kb": round(result.peak_kb, 1),
+                }
+            elif key in baselines:
+                regressions.extend(
+                    find_regressions(key, result, baselines[key], args.threshold)
+                )
+
+    if args.update_baselines:
+        save_baselines(baselines)
+        print(f"Baselines saved to {BASELINES_PATH}")
+        return
+
+    if regressions:
+        print("\nRegressions:")
+        print("\n".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,14 @@ import logging
 import os
 import pickle
 import time
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
-from typing import List, NamedTuple
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Optional, Tuple
 
-import numpy as np
-import pandas as pd
 import selenium.webdriver.chrome.service as chrome_service
 from selenium.webdriver import Chrome, ChromeOptions
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
@@ -25,8 +25,17 @@ from src.data import (
     Order,
     FiringOrder,
     MentorshipOrder,
+    get_order_date,
 )
+from src.importtime import lazy_import
+from src.metrics import metrics
+from src.names import split_names
 from src.notification import TelegramAPI
+from src.serialization import dumps_orders
+from src.sync_state import SyncState
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ChromePath(NamedTuple):
@@ -43,31 +52,115 @@ class BpmInfo(NamedTuple):
     chrome_path: ChromePath
     creds: CredentialsBPM
     download_folder: str
+    base_url: str = "https://bpmtest.kdb.kz/"
+    lightweight: bool = False
+    profile_folder: Optional[str] = None
+
+
+BLOCKED_URL_PATTERNS = [
+    "*.css",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.eot",
+]
+
+
+DATED_PROCESS_TYPES = {ProcessType.VACATION_ADD_PAY}
 
 
 def driver_init(bpm_info: BpmInfo) -> Chrome:
+    start_time = time.perf_counter()
+
     service = chrome_service.Service(executable_path=bpm_info.chrome_path.driver_path)
     options = ChromeOptions()
     options.binary_location = bpm_info.chrome_path.binary_path
-    prefs = {"profile.default_content_setting_values.notifications": 2}
-    options.add_experimental_option("prefs", prefs)
-    options.add_argument("--start-maximized")
+    prefs = {
+        "profile.default_content_setting_values.notifications": 2,
+        "download.default_directory": bpm_info.download_folder,
+        "download.directory_upgrade": True,
+        "download.prompt_for_download": False,
+    }
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
     options.add_argument("--log-level=3")
-    options.add_experimental_option(
-        "prefs",
-        {
-            "download.default_directory": bpm_info.download_folder,
-            "download.directory_upgrade": True,
-            "download.prompt_for_download": False,
-        },
-    )
+
+    if bpm_info.profile_folder:
+        os.makedirs(bpm_info.profile_folder, exist_ok=True)
+        options.add_argument(f"--user-data-dir={bpm_info.profile_folder}")
+
+    if bpm_info.lightweight:
+        prefs["profile.managed_default_content_settings.images"] = 2
+        prefs["profile.managed_default_content_settings.fonts"] = 2
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.page_load_strategy = "eager"
+    else:
+        options.add_argument("--start-maximized")
+
+    options.add_experimental_option("prefs", prefs)
     driver = Chrome(service=service, options=options)
+
+    if bpm_info.lightweight:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}
+        )
+        set_download_folder(driver=driver, download_folder=bpm_info.download_folder)
+
+    logging.info(
+        f"Chrome started in {time.perf_counter() - start_time:.2f}s "
+        f"(lightweight={bpm_info.lightweight}, "
+        f"profile_folder={bpm_info.profile_folder})"
+    )
     return driver
 
 
-def login(driver: Chrome, wait: WebDriverWait, creds: CredentialsBPM) -> None:
-    driver.get("https://bpmtest.kdb.kz/")
+def set_download_folder(driver: Chrome, download_folder: str) -> None:
+    driver.execute_cdp_cmd(
+        "Browser.setDownloadBehavior",
+        {"behavior": "allow", "downloadPath": download_folder},
+    )
+
+
+def is_session_valid(driver: Chrome, base_url: str, timeout: int = 5) -> bool:
+    start_time = time.perf_counter()
+    driver.get(base_url)
+
+    if driver.find_elements(By.NAME, "u_login"):
+        is_valid = False
+    else:
+        try:
+            WebDriverWait(driver, timeout).until(
+                ec.presence_of_element_located(
+                    (By.CSS_SELECTOR, ".cp_menu_section_div_v.cp_menu_simple")
+                )
+            )
+            is_valid = True
+        except TimeoutException:
+            is_valid = False
+
+    logging.info(
+        f"Session check took {time.perf_counter() - start_time:.2f}s "
+        f"(is_valid={is_valid})"
+    )
+    return is_valid
+
+
+def login(
+    driver: Chrome, wait: WebDriverWait, creds: CredentialsBPM, base_url: str
+) -> None:
+    start_time = time.perf_counter()
+    driver.get(base_url)
 
     user_input = wait.until(ec.presence_of_element_located((By.NAME, "u_login")))
     user_input.send_keys(creds.user)
@@ -78,6 +171,8 @@ def login(driver: Chrome, wait: WebDriverWait, creds: CredentialsBPM) -> None:
     submit_button = wait.until(ec.presence_of_element_located((By.NAME, "submit")))
     submit_button.click()
 
+    logging.info(f"Login took {time.perf_counter() - start_time:.2f}s")
+
 
 def download_report(
     driver: Chrome,
@@ -90,7 +185,12 @@ def download_report(
             (By.CSS_SELECTOR, ".cp_menu_section_div_v.cp_menu_simple")
         )
     )
+    page_start_time = time.perf_counter()
     driver.get(process.download_url)
+    logging.info(
+        f"{process.process_type.name} report page loaded in "
+        f"{time.perf_counter() - page_start_time:.2f}s"
+    )
 
     if process.process_type == ProcessType.VACATION_ADD_PAY:
         order_date_input = wait.until(
@@ -128,6 +228,7 @@ def download_report(
     download_folder = os.path.dirname(os.path.dirname(process.csv_path))
     before_download = set(Path(download_folder).iterdir())
 
+    download_start_time = time.perf_counter()
     download_csv_button.click()
 
     end_time = time.time() + timeout
@@ -143,26 +244,74 @@ def download_report(
                 old_file_path,
                 process.csv_path,
             )
+            logging.info(
+                f"{process.process_type.name} report downloaded in "
+                f"{time.perf_counter() - download_start_time:.2f}s"
+            )
             return True
 
-    print("Download did not complete within the timeout period.")
+    logging.warning(
+        f"{process.process_type.name} report download did not complete "
+        f"within {timeout}s"
+    )
     return False
 
 
-def convert_to_dataclass(process: Process, is_empty: bool) -> int:
+def to_dates(column: "pd.Series", **kwargs: Any) -> List[Optional[Date]]:
+    pd = lazy_import("pandas")
+    return Date.from_values(pd.to_datetime(column, **kwargs))
+
+
+def dump_orders(process: Process, orders: List[Order]) -> None:
+    with open(process.pickle_path, "wb") as f:
+        pickle.dump(orders, f)
+
+    orders_json_path = process.pickle_path.replace(".pkl", ".json")
+    with open(orders_json_path, "w", encoding="utf-8") as f:
+        f.write(dumps_orders(orders))
+
+
+def split_by_day(
+    day_processes: List[Process], orders: List[Order]
+) -> List[List[Order]]:
+    days = [
+        datetime.strptime(day_process.today, "%d.%m.%y").date()
+        for day_process in day_processes
+    ]
+
+    day_orders: List[List[Order]] = [[] for _ in day_processes]
+    for order in orders:
+        order_date = get_order_date(order)
+        if order_date is None:
+            idx = len(days) - 1
+        else:
+            idx = max(bisect_right(days, order_date.dt.date()) - 1, 0)
+        day_orders[idx].append(order)
+    return day_orders
+
+
+def dump_day_orders(day_processes: List[Process], orders: List[Order]) -> None:
+    for day_process, day_orders in zip(
+        day_processes, split_by_day(day_processes=day_processes, orders=orders)
+    ):
+        dump_orders(process=day_process, orders=day_orders)
+
+
+def convert_to_dataclass(
+    process: Process,
+    is_empty: bool,
+    sync_state: Optional[SyncState] = None,
+    day_processes: Optional[List[Process]] = None,
+) -> Tuple[int, int]:
     orders: List[Order] = []
+    day_processes = day_processes or [process]
 
     if is_empty:
-        with open(process.pickle_path, "wb") as f:
-            pickle.dump(orders, f)
-
-        orders_json_path = process.pickle_path.replace(".pkl", ".json")
-        with open(orders_json_path, "w", encoding="utf-8") as f:
-            json.dump(
-                [order.as_dict() for order in orders], f, ensure_ascii=False, indent=2
-            )
+        dump_day_orders(day_processes=day_processes, orders=orders)
+        return 0, 0
 
-        return len(orders)
+    pd = lazy_import("pandas")
+    np = lazy_import("numpy")
 
     df = pd.read_csv(process.csv_path, delimiter=";", dtype=str)
 
@@ -188,13 +337,17 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
 
             assert len(df.columns) == 10, "Странное кол-во колонок"
 
-            df.loc[:, "employee_names"] = df["employee_fullname"].str.split()
-            df.loc[:, "deputy_names"] = df["deputy_fullname"].str.split()
+            df.loc[:, "employee_names"] = df["employee_fullname"].map(
+                split_names, na_action="ignore"
+            )
+            df.loc[:, "deputy_names"] = df["deputy_fullname"].map(
+                split_names, na_action="ignore"
+            )
 
-            df["sign_date"] = pd.to_datetime(df["sign_date"], format="%d.%m.%Y")
-            df["start_date"] = pd.to_datetime(df["start_date"], format="%d.%m.%Y")
-            df["end_date"] = pd.to_datetime(df["end_date"], format="%d.%m.%Y")
-            df["main_order_start_date"] = pd.to_datetime(
+            df["sign_date"] = to_dates(df["sign_date"], format="%d.%m.%Y")
+            df["start_date"] = to_dates(df["start_date"], format="%d.%m.%Y")
+            df["end_date"] = to_dates(df["end_date"], format="%d.%m.%Y")
+            df["main_order_start_date"] = to_dates(
                 df["main_order_start_date"], format="%d.%m.%Y"
             )
             df = df.replace({np.nan: None})
@@ -221,14 +374,14 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
                     employee_fullname=order_dict["employee_fullname"],
                     employee_names=order_dict["employee_names"],
                     order_number=order_dict["order_number"],
-                    sign_date=Date(order_dict["sign_date"]),
-                    start_date=Date(order_dict["start_date"]),
-                    end_date=Date(order_dict["end_date"]),
+                    sign_date=order_dict["sign_date"],
+                    start_date=order_dict["start_date"],
+                    end_date=order_dict["end_date"],
                     trip_place=trip_place,
                     trip_code=trip_code,
                     trip_reason=order_dict["trip_reason"],
                     main_order_number=order_dict["main_order_number"],
-                    main_order_start_date=Date(order_dict["main_order_start_date"]),
+                    main_order_start_date=order_dict["main_order_start_date"],
                     deputy_fullname=order_dict["deputy_fullname"],
                     deputy_names=order_dict["deputy_names"],
                 )
@@ -251,11 +404,15 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
 
             df = df.dropna(subset=["employee_fullname"])
 
-            df.loc[:, "employee_names"] = df["employee_fullname"].str.split()
-            df.loc[:, "deputy_names"] = df["deputy_fullname"].str.split()
+            df.loc[:, "employee_names"] = df["employee_fullname"].map(
+                split_names, na_action="ignore"
+            )
+            df.loc[:, "deputy_names"] = df["deputy_fullname"].map(
+                split_names, na_action="ignore"
+            )
 
-            df["start_date"] = pd.to_datetime(df["start_date"], format="%d.%m.%Y")
-            df["end_date"] = pd.to_datetime(df["end_date"], format="%d.%m.%Y")
+            df["start_date"] = to_dates(df["start_date"], format="%d.%m.%Y")
+            df["end_date"] = to_dates(df["end_date"], format="%d.%m.%Y")
             df = df.replace({np.nan: None})
 
             for _, order_dict in df.iterrows():
@@ -274,8 +431,8 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
                     employee_fullname=order_dict["employee_fullname"],
                     employee_names=order_dict["employee_names"],
                     order_type=order_type,
-                    start_date=Date(order_dict["start_date"]),
-                    end_date=Date(order_dict["end_date"]),
+                    start_date=order_dict["start_date"],
+                    end_date=order_dict["end_date"],
                     order_number=order_number,
                     deputy_fullname=order_dict["deputy_fullname"],
                     deputy_names=order_dict["deputy_names"],
@@ -297,9 +454,11 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
             df = df.dropna(subset=["employee_fullname"])
             df = df.dropna(subset=["withdraw_date"])
 
-            df.loc[:, "employee_names"] = df["employee_fullname"].str.split()
+            df.loc[:, "employee_names"] = df["employee_fullname"].map(
+                split_names, na_action="ignore"
+            )
 
-            df["withdraw_date"] = pd.to_datetime(df["withdraw_date"], format="%d.%m.%Y")
+            df["withdraw_date"] = to_dates(df["withdraw_date"], format="%d.%m.%Y")
             df = df.replace({np.nan: None})
 
             for _, order_dict in df.iterrows():
@@ -308,7 +467,7 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
                     employee_names=order_dict["employee_names"],
                     order_type=order_dict["order_type"],
                     order_number=order_dict["order_number"],
-                    withdraw_date=Date(order_dict["withdraw_date"]),
+                    withdraw_date=order_dict["withdraw_date"],
                 )
                 orders.append(order)
 
@@ -325,9 +484,11 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
             df = df.dropna(subset=["employee_fullname"])
             df = df.dropna(subset=["firing_date"])
 
-            df.loc[:, "employee_names"] = df["employee_fullname"].str.split()
+            df.loc[:, "employee_names"] = df["employee_fullname"].map(
+                split_names, na_action="ignore"
+            )
 
-            df["firing_date"] = pd.to_datetime(df["firing_date"], format="%d.%m.%Y")
+            df["firing_date"] = to_dates(df["firing_date"], format="%d.%m.%Y")
             df = df.replace({np.nan: None})
 
             for _, order_dict in df.iterrows():
@@ -337,7 +498,7 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
                     firing_reason=order_dict["firing_reason"],
                     order_number=order_dict["order_number"],
                     compensation=order_dict["compensation"],
-                    firing_date=Date(order_dict["firing_date"]),
+                    firing_date=order_dict["firing_date"],
                 )
                 orders.append(order)
 
@@ -387,22 +548,28 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
             df = df.dropna(subset=["contract_start_date"])
             df = df.dropna(subset=["mentor_fullname"])
 
-            df.loc[:, "employee_names"] = df["employee_fullname"].str.split()
-            df.loc[:, "mentor_names"] = df["mentor_fullname"].str.split()
+            df.loc[:, "employee_names"] = df["employee_fullname"].map(
+                split_names, na_action="ignore"
+            )
+            df.loc[:, "mentor_names"] = df["mentor_fullname"].map(
+                split_names, na_action="ignore"
+            )
 
             for col in [
                 "work_start_date",
                 "contract_start_date",
-                "contract_start_date",
+                "contract_end_date",
                 "mentorship_start_date",
                 "mentorship_end_date",
             ]:
-                df[col] = pd.to_datetime(df[col], format="%d.%m.%Y")
+                df[col] = to_dates(df[col], format="%d.%m.%Y")
+            df["creation_date"] = to_dates(df["creation_date"], dayfirst=True)
             df = df.replace({np.nan: None})
 
             for _, order_dict in df.iterrows():
                 order = MentorshipOrder(
                     employee_fullname=order_dict["employee_fullname"],
+                    employee_names=order_dict["employee_names"],
                     work_start_date=order_dict["work_start_date"],
                     contract_start_date=order_dict["contract_start_date"],
                     contract_end_date=order_dict["contract_end_date"],
@@ -411,6 +578,7 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
                     mentorship_start_date=order_dict["mentorship_start_date"],
                     mentorship_end_date=order_dict["mentorship_end_date"],
                     creation_date=order_dict["creation_date"],
+                    mentor_names=order_dict["mentor_names"],
                 )
                 orders.append(order)
 
@@ -420,36 +588,79 @@ def convert_to_dataclass(process: Process, is_empty: bool) -> int:
                 f"value={process.process_type.value})"
             )
 
-    with open(process.pickle_path, "wb") as f:
-        pickle.dump(orders, f)
-
-    orders_json_path = process.pickle_path.replace(".pkl", ".json")
-    with open(orders_json_path, "w", encoding="utf-8") as f:
-        json.dump(
-            [order.as_dict() for order in orders], f, ensure_ascii=False, indent=2
-        )
+    total_count = len(orders)
+    if sync_state is not None:
+        orders = sync_state.filter_new(process.process_type, orders)
+
+    dump_day_orders(day_processes=day_processes, orders=orders)
+
+    return total_count, len(orders)
+
+
+class ReportDownloader:
+    def __init__(self, driver: Chrome, bpm_info: BpmInfo) -> None:
+        self.driver = driver
+        self.bpm_info = bpm_info
+        self.download_folder = bpm_info.download_folder
+        self.is_logged_in = False
+
+    def set_download_folder(self, download_folder: str) -> None:
+        if download_folder != self.download_folder:
+            set_download_folder(driver=self.driver, download_folder=download_folder)
+            self.download_folder = download_folder
+
+    def __call__(self, process: Process) -> bool:
+        wait = WebDriverWait(self.driver, 10)
+        if not self.is_logged_in:
+            if not self.bpm_info.profile_folder or not is_session_valid(
+                driver=self.driver, base_url=self.bpm_info.base_url
+            ):
+                login(
+                    self.driver,
+                    wait,
+                    creds=self.bpm_info.creds,
+                    base_url=self.bpm_info.base_url,
+                )
+            self.is_logged_in = True
 
-    return len(orders)
+        return download_report(driver=self.driver, wait=wait, process=process)
 
 
 def run(
-    driver: Chrome,
-    creds: CredentialsBPM,
     process: Process,
     bot: TelegramAPI,
-    is_logged_in: bool,
+    download: Callable[[Process], bool],
+    sync_state: Optional[SyncState] = None,
+    reuse_csv: bool = False,
+    day_processes: Optional[List[Process]] = None,
 ) -> None:
-    wait = WebDriverWait(driver, 10)
-    if not is_logged_in:
-        login(driver, wait, creds=creds)
-
-    is_empty = not download_report(
-        driver=driver,
-        wait=wait,
-        process=process,
+    if reuse_csv and os.path.exists(process.csv_path):
+        logging.info(f"Reusing already downloaded {process.csv_path}")
+        is_empty = False
+    else:
+        with metrics.timer(
+            "bpm_download_seconds", process=process.process_type.name.lower()
+        ):
+            is_empty = not download(process)
+
+    with metrics.timer("bpm_parse_seconds", process=process.process_type.name.lower()):
+        total_count, new_count = convert_to_dataclass(
+            process=process,
+            is_empty=is_empty,
+            sync_state=sync_state,
+            day_processes=day_processes,
+        )
+    metrics.inc(
+        "bpm_orders_total", total_count, process=process.process_type.name.lower()
+    )
+    metrics.inc(
+        "bpm_new_orders_total", new_count, process=process.process_type.name.lower()
     )
-    order_count = convert_to_dataclass(process=process, is_empty=is_empty)
 
+    period = process.today
+    if day_processes and len(day_processes) > 1:
+        period = f"{day_processes[0].today} - {day_processes[-1].today}"
     bot.send_message(
-        f"{process.process_type.name} - {order_count} - кол-во приказов из BPM"
+        f"{process.process_type.name} ({period}) - {total_count} - "
+        f"кол-во приказов из BPM, {new_count} - новых"
     )
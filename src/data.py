@@ -1,7 +1,20 @@
 import dataclasses
+import functools
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union, Iterator, NamedTuple, Tuple
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 
 class ProcessType(Enum):
@@ -39,31 +52,120 @@ class Processes:
             yield getattr(self, field.name)
 
 
-@dataclasses.dataclass(slots=True)
+@functools.total_ordering
 class Date:
-    dt: datetime
-    long: Optional[str] = None
-    short: Optional[str] = None
-    colvir: Optional[str] = None
+    __slots__ = ("dt", "_long", "_short", "_colvir", "_dict")
 
-    def __attrs_post_init__(self):
-        self.long = self.dt.strftime("%d.%m.%Y")
-        self.short = self.dt.strftime("%d.%m.%y")
-        self.colvir = self.dt.strftime("%d%m%y")
+    _interned: ClassVar[Dict[datetime, "Date"]] = {}
 
-    def as_dict(self):
-        return {
-            "dt": self.dt.isoformat(),
-            "long": self.long,
-            "short": self.short,
-            "colvir": self.colvir,
-        }
+    dt: datetime
+    _long: Optional[str]
+    _short: Optional[str]
+    _colvir: Optional[str]
+    _dict: Optional[Dict[str, str]]
+
+    def __new__(cls, dt: datetime) -> "Date":
+        # the time part is kept, "Дата создания" of mentorships carries one
+        key = datetime(
+            dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond
+        )
+        date = cls._interned.get(key)
+        if date is None:
+            date = object.__new__(cls)
+            object.__setattr__(date, "dt", key)
+            object.__setattr__(date, "_long", None)
+            object.__setattr__(date, "_short", None)
+            object.__setattr__(date, "_colvir", None)
+            object.__setattr__(date, "_dict", None)
+            date = cls._interned.setdefault(key, date)
+        return date
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> List[Optional["Date"]]:
+        dates: Dict[Any, Date] = {}
+        result: List[Optional[Date]] = []
+        for value in values:
+            if value is None or value != value:
+                result.append(None)
+                continue
+            date = dates.get(value)
+            if date is None:
+                date = dates[value] = cls(value)
+            result.append(date)
+        return result
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Date is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Date is immutable")
+
+    def __reduce__(self) -> Tuple[Type["Date"], Tuple[datetime]]:
+        return Date, (self.dt,)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self.dt == other.dt
+
+    def __hash__(self) -> int:
+        return hash(self.dt)
+
+    def __lt__(self, other: Any) -> bool:
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self.dt < other.dt
+
+    def __repr__(self) -> str:
+        return f"Date({self.long})"
+
+    @property
+    def long(self) -> str:
+        if self._long is None:
+            object.__setattr__(self, "_long", self.dt.strftime("%d.%m.%Y"))
+        return self._long
+
+    @property
+    def short(self) -> str:
+        if self._short is None:
+            object.__setattr__(self, "_short", self.dt.strftime("%d.%m.%y"))
+        return self._short
+
+    @property
+    def colvir(self) -> str:
+        if self._colvir is None:
+            object.__setattr__(self, "_colvir", self.dt.strftime("%d%m%y"))
+        return self._colvir
+
+    def as_dict(self) -> Dict[str, str]:
+        if self._dict is None:
+            object.__setattr__(
+                self,
+                "_dict",
+                {
+                    "dt": self.dt.isoformat(),
+                    "long": self.long,
+                    "short": self.short,
+                    "colvir": self.colvir,
+                },
+            )
+        return self._dict
+
+
+def field(short: bool = True, serialize: bool = True, **kwargs: Any) -> Any:
+    return dataclasses.field(
+        metadata={"short": short, "serialize": serialize}, **kwargs
+    )
+
+
+def runtime_field() -> Any:
+    return field(short=False, serialize=False, default=None)
 
 
 @dataclasses.dataclass(slots=True)
 class BusinessTripOrder:
     employee_fullname: str
-    employee_names: Tuple[str, str]
+    employee_names: Tuple[str, str] = field(short=False)
     order_number: str
     sign_date: Date
     start_date: Date
@@ -74,153 +176,59 @@ class BusinessTripOrder:
     main_order_number: str
     main_order_start_date: Date
     deputy_fullname: Optional[str]
-    deputy_names: Optional[Tuple[str, str]]
-    employee_status: Optional[str] = None
-    branch_num: Optional[str] = None
-    tab_num: Optional[str] = None
-
-    def as_dict_short(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "order_number": self.order_number,
-            "sign_date": self.sign_date.short,
-            "start_date": self.start_date.short,
-            "end_date": self.end_date.short,
-            "trip_place": self.trip_place,
-            "trip_code": self.trip_code,
-            "trip_reason": self.trip_reason,
-            "main_order_number": self.main_order_number,
-            "main_order_start_date": self.main_order_start_date.short,
-            "deputy_fullname": self.deputy_fullname,
-        }
-
-    def as_dict(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "employee_names": self.employee_names,
-            "order_number": self.order_number,
-            "sign_date": self.sign_date.as_dict(),
-            "start_date": self.start_date.as_dict(),
-            "end_date": self.end_date.as_dict(),
-            "trip_place": self.trip_place,
-            "trip_code": self.trip_code,
-            "trip_reason": self.trip_reason,
-            "main_order_number": self.main_order_number,
-            "main_order_start_date": self.main_order_start_date.as_dict(),
-            "deputy_fullname": self.deputy_fullname,
-            "deputy_names": self.deputy_names,
-        }
+    deputy_names: Optional[Tuple[str, str]] = field(short=False)
+    employee_status: Optional[str] = runtime_field()
+    branch_num: Optional[str] = runtime_field()
+    tab_num: Optional[str] = runtime_field()
 
 
 @dataclasses.dataclass(slots=True)
 class VacationOrder:
     employee_fullname: str
-    employee_names: Tuple[str, str]
+    employee_names: Tuple[str, str] = field(short=False)
     order_type: str
     start_date: Date
     end_date: Date
     order_number: str
     deputy_fullname: str
-    deputy_names: Optional[Tuple[str, str]]
+    deputy_names: Optional[Tuple[str, str]] = field(short=False)
     surcharge: str
     substitution_start: str
     substitution_end: str
-    employee_status: Optional[str] = None
-    branch_num: Optional[str] = None
-    tab_num: Optional[str] = None
-
-    def as_dict_short(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "order_type": self.order_type,
-            "order_number": self.order_number,
-            "start_date": self.start_date.short,
-            "end_date": self.end_date.short,
-            "deputy_fullname": self.deputy_fullname,
-            "surcharge": self.surcharge,
-            "substitution_start": self.substitution_start,
-            "substitution_end": self.substitution_end,
-        }
-
-    def as_dict(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "employee_names": self.employee_names,
-            "order_type": self.order_type,
-            "start_date": self.start_date.as_dict(),
-            "end_date": self.end_date.as_dict(),
-            "order_number": self.order_number,
-            "deputy_fullname": self.deputy_fullname,
-            "deputy_names": self.deputy_names,
-            "surcharge": self.surcharge,
-            "substitution_start": self.substitution_start,
-            "substitution_end": self.substitution_end,
-        }
+    employee_status: Optional[str] = runtime_field()
+    branch_num: Optional[str] = runtime_field()
+    tab_num: Optional[str] = runtime_field()
 
 
 @dataclasses.dataclass(slots=True)
 class VacationWithdrawOrder:
     employee_fullname: str
-    employee_names: Tuple[str, str]
+    employee_names: Tuple[str, str] = field(short=False)
     order_type: str
     order_number: str
     withdraw_date: Date
-    employee_status: Optional[str] = None
-    branch_num: Optional[str] = None
-    tab_num: Optional[str] = None
-
-    def as_dict_short(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "order_type": self.order_type,
-            "order_number": self.order_number,
-            "withdraw_date": self.withdraw_date.short,
-        }
-
-    def as_dict(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "employee_names": self.employee_names,
-            "order_type": self.order_type,
-            "order_number": self.order_number,
-            "withdraw_date": self.withdraw_date.as_dict(),
-        }
+    employee_status: Optional[str] = runtime_field()
+    branch_num: Optional[str] = runtime_field()
+    tab_num: Optional[str] = runtime_field()
 
 
 @dataclasses.dataclass(slots=True)
 class FiringOrder:
     employee_fullname: str
-    employee_names: Tuple[str, str]
+    employee_names: Tuple[str, str] = field(short=False)
     firing_reason: str
     order_number: str
-    compensation: str
+    compensation: str = field(short=False)
     firing_date: Date
-    employee_status: Optional[str] = None
-    branch_num: Optional[str] = None
-    tab_num: Optional[str] = None
-
-    def as_dict_short(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "firing_reason": self.firing_reason,
-            "order_number": self.order_number,
-            "firing_date": self.firing_date.short,
-        }
-
-    def as_dict(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "employee_names": self.employee_names,
-            "firing_reason": self.firing_reason,
-            "order_number": self.order_number,
-            "compensation": self.compensation,
-            "firing_date": self.firing_date.as_dict(),
-        }
+    employee_status: Optional[str] = runtime_field()
+    branch_num: Optional[str] = runtime_field()
+    tab_num: Optional[str] = runtime_field()
 
 
 @dataclasses.dataclass(slots=True)
 class MentorshipOrder:
     employee_fullname: str
+    employee_names: Tuple[str, str] = field(short=False)
     work_start_date: Date
     contract_start_date: Date
     contract_end_date: Date
@@ -229,50 +237,23 @@ class MentorshipOrder:
     mentorship_start_date: Date
     mentorship_end_date: Date
     creation_date: Date
-    employee_status: Optional[str] = None
-    branch_num: Optional[str] = None
-    tab_num: Optional[str] = None
-
-    def as_dict_short(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "work_start_date": self.work_start_date.short,
-            "contract_start_date": self.contract_start_date.short,
-            "contract_end_date": self.contract_end_date.short,
-            "mentor_fullname": self.mentor_fullname,
-            "mentrorship_order_number": self.mentrorship_order_number,
-            "mentorship_start_date": self.mentorship_start_date.short,
-            "mentorship_end_date": self.mentorship_end_date.short,
-            "creation_date": self.creation_date.short,
-        }
-
-    def as_dict(self):
-        return {
-            "employee_fullname": self.employee_fullname,
-            "work_start_date": self.work_start_date.as_dict(),
-            "contract_start_date": self.contract_start_date.as_dict(),
-            "contract_end_date": self.contract_end_date.as_dict(),
-            "mentor_fullname": self.mentor_fullname,
-            "mentrorship_order_number": self.mentrorship_order_number,
-            "mentorship_start_date": self.mentorship_start_date.as_dict(),
-            "mentorship_end_date": self.mentorship_end_date.as_dict(),
-            "creation_date": self.creation_date.as_dict(),
-        }
+    mentor_names: Tuple[str, str] = field(short=False)
+    employee_status: Optional[str] = runtime_field()
+    branch_num: Optional[str] = runtime_field()
+    tab_num: Optional[str] = runtime_field()
+
+    @property
+    def order_number(self) -> str:
+        return self.mentrorship_order_number
 
 
 @dataclasses.dataclass(slots=True)
 class VacationAddPayOrder:
     # FIXME
     date: Date
-    employee_status: Optional[str] = None
-    branch_num: Optional[str] = None
-    tab_num: Optional[str] = None
-
-    def as_dict_short(self):
-        raise NotImplementedError()
-
-    def as_dict(self):
-        raise NotImplementedError()
+    employee_status: Optional[str] = runtime_field()
+    branch_num: Optional[str] = runtime_field()
+    tab_num: Optional[str] = runtime_field()
 
 
 Order = Union[
@@ -283,3 +264,21 @@ Order = Union[
     MentorshipOrder,
     VacationAddPayOrder,
 ]
+
+
+def get_order_date(order: Order) -> Optional[Date]:
+    match order:
+        case BusinessTripOrder():
+            return order.start_date
+        case VacationOrder():
+            return order.start_date
+        case VacationWithdrawOrder():
+            return order.withdraw_date
+        case FiringOrder():
+            return order.firing_date
+        case MentorshipOrder():
+            return order.creation_date
+        case VacationAddPayOrder():
+            return order.date
+        case _:
+            raise ValueError(f"Order is of unknown type - {type(order)}")
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from src.data import ProcessType
+from src.metrics import metrics
+from src.names import MatchKind, NameIndex, normalize_name
+
+DEFAULT_TTL = timedelta(hours=24)
+
+STATUS_CHANGING_TYPES = {
+    ProcessType.BUSINESS_TRIP,
+    ProcessType.VACATION,
+    ProcessType.VACATION_WITHDRAW,
+    ProcessType.FIRING,
+}
+
+
+class EmployeeRecord(NamedTuple):
+    branch_num: str
+    tab_num: str
+    status: str
+    updated_at: str = ""
+    fullname: str = ""
+
+
+class EmployeeCache:
+    def __init__(self, cache_path: str, ttl: timedelta = DEFAULT_TTL) -> None:
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.records: Dict[str, EmployeeRecord] = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            self.records = {
+                key: EmployeeRecord(**values) for key, values in records.items()
+            }
+
+    def is_fresh(self, record: EmployeeRecord) -> bool:
+        updated_at = datetime.fromisoformat(record.updated_at)
+        return datetime.now() - updated_at < self.ttl
+
+    def get(self, fullname: str) -> Optional[EmployeeRecord]:
+        record = self.records.get(normalize_name(fullname))
+        if record is None or not self.is_fresh(record):
+            metrics.inc("employee_cache_total", result="miss")
+            return None
+
+        metrics.inc("employee_cache_total", result="hit")
+        return record
+
+    def put(self, fullname: str, record: EmployeeRecord) -> None:
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.records[normalize_name(fullname)] = record._replace(
+                updated_at=updated_at
+            )
+            self.save()
+
+    def get_name_entries(self) -> List[Tuple[str, EmployeeRecord]]:
+        return [
+            (record.fullname, record)
+            for record in self.records.values()
+            if record.fullname
+        ]
+
+    def invalidate(self, fullname: str) -> None:
+        with self.lock:
+            if self.records.pop(normalize_name(fullname), None) is not None:
+                self.save()
+
+    def save(self) -> None:
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {key: record._asdict() for key, record in self.records.items()},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.cache_path)
+
+
+class PersonnelTable:
+    def __init__(self, records: List[EmployeeRecord]) -> None:
+        self.records = records
+        self.index = NameIndex((record.fullname, record) for record in records)
+        self.stale_tab_nums: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def find(self, fullname: str) -> Optional[EmployeeRecord]:
+        match = self.index.resolve(fullname)
+        if match.kind != MatchKind.EXACT:
+            return None
+
+        _, record = match.candidates[0]
+        if record.tab_num in self.stale_tab_nums:
+            return None
+        return record
+
+    def forget(self, fullname: str) -> None:
+        if (record := self.find(fullname)) is not None:
+            self.stale_tab_nums.add(record.tab_num)
@@ -0,0 +1,33 @@
+import importlib
+import logging
+import sys
+import time
+from types import ModuleType
+from typing import Dict
+
+import_times: Dict[str, float] = {}
+
+
+def lazy_import(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    start_time = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start_time
+
+    import_times[name] = elapsed
+    logging.info(f"Imported {name} in {elapsed:.2f}s")
+    return module
+
+
+def import_report() -> str:
+    lines = [
+        f"{name} - {elapsed:.2f} с"
+        for name, elapsed in sorted(
+            import_times.items(), key=lambda item: item[1], reverse=True
+        )
+    ]
+    lines.append(f"Всего - {sum(import_times.values()):.2f} с")
+    return "\n".join(lines)
@@ -5,7 +5,7 @@ import smtplib
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional
 
 
 class Mail(NamedTuple):
@@ -13,7 +13,9 @@ class Mail(NamedTuple):
     sender: str
     recipients: str
     subject: str
-    attachment_path: str
+    attachment_path: Optional[str]
+    body: Optional[str] = None
+    port: int = 25
 
 
 def send_mail(mail_info: Mail) -> bool:
@@ -24,16 +26,17 @@ def send_mail(mail_info: Mail) -> bool:
     msg["To"] = mail_info.recipients
     msg["Date"] = email.utils.formatdate(localtime=True)
     msg["Subject"] = mail_info.subject
-    msg.attach(MIMEText(mail_info.subject, "html", "utf-8"))
+    msg.attach(MIMEText(mail_info.body or mail_info.subject, "html", "utf-8"))
 
-    attachment_name = os.path.basename(mail_info.attachment_path)
-    with open(mail_info.attachment_path, "rb") as f:
-        part = MIMEApplication(f.read(), Name=attachment_name)
-    part.add_header("Content-Disposition", "attachment", filename=attachment_name)
-    msg.attach(part)
+    if mail_info.attachment_path is not None:
+        attachment_name = os.path.basename(mail_info.attachment_path)
+        with open(mail_info.attachment_path, "rb") as f:
+            part = MIMEApplication(f.read(), Name=attachment_name)
+        part.add_header("Content-Disposition", "attachment", filename=attachment_name)
+        msg.attach(part)
 
     try:
-        with smtplib.SMTP(mail_info.server, 25) as smtp:
+        with smtplib.SMTP(mail_info.server, mail_info.port) as smtp:
             response = smtp.sendmail(mail_info.sender, recipients_lst, msg.as_string())
             if response:
                 logging.error("Failed to send email to the following recipients:")
@@ -1,12 +1,91 @@
+import argparse
 import os
 import sys
+from datetime import datetime
+
+import dotenv
 
 project_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_folder)
 
-from src.notification import TelegramAPI
-from src import process_manager
+from src.importtime import import_report, lazy_import
+from src.logs import log_context, setup_logging
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%d.%m.%Y")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--full-resync",
+        action="store_true",
+        help="Process every order from the BPM reports, ignoring the sync state",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=parse_date,
+        default=None,
+        help="First day (dd.mm.yyyy) of a backfill, defaults to today",
+    )
+    parser.add_argument(
+        "--end-date",
+        type=parse_date,
+        default=None,
+        help="Last day (dd.mm.yyyy) of a backfill, defaults to --start-date",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Minutes after which the run stops taking new orders",
+    )
+    parser.add_argument(
+        "--resident",
+        action="store_true",
+        help="Attach to the Colvir session kept by a previous run and leave it running",
+    )
+    parser.add_argument(
+        "--colvir-agent",
+        type=float,
+        default=None,
+        metavar="MINUTES",
+        help="Keep a logged in Colvir session alive, checking it every MINUTES",
+    )
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="Print how long each lazily loaded module took to import",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    telegram_bot = TelegramAPI()
-    process_manager.run(bot=telegram_bot)
+    args = parse_args()
+    dotenv.load_dotenv(os.path.join(project_folder, ".env.test"))
+    log_listener = setup_logging(
+        os.path.join(project_folder, "data", "logs"),
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        console_level=os.getenv("LOG_CONSOLE_LEVEL"),
+    )
+    try:
+        with log_context(run_id=datetime.now().strftime("%Y%m%d_%H%M%S")):
+            notification = lazy_import("src.notification")
+            process_manager = lazy_import("src.process_manager")
+            if args.colvir_agent is not None:
+                process_manager.run_colvir_agent(interval=args.colvir_agent)
+            else:
+                telegram_bot = notification.TelegramAPI()
+                process_manager.run(
+                    bot=telegram_bot,
+                    full_resync=args.full_resync,
+                    start_date=args.start_date,
+                    end_date=args.end_date,
+                    time_budget=args.time_budget,
+                    resident=args.resident,
+                )
+    finally:
+        log_listener.stop()
+    if args.import_report:
+        print(import_report())
@@ -0,0 +1,198 @@
+import dataclasses
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+HISTORY_DAYS = 180
+
+
+@dataclasses.dataclass(slots=True)
+class Histogram:
+    buckets: Tuple[float, ...]
+    counts: List[int]
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+
+def to_labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [f'{key}="{escape_label_value(value)}"' for key, value in pairs]
+    return "{" + ",".join(escaped) + "}"
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.gauges: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+
+    def inc(self, name: str, value: float = 1.0, **labels: object) -> None:
+        key = (name, to_labels(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: object) -> None:
+        with self.lock:
+            self.gauges[(name, to_labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = (name, to_labels(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(
+                    buckets=DEFAULT_BUCKETS, counts=[0] * len(DEFAULT_BUCKETS)
+                )
+                self.histograms[key] = histogram
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        start_time = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+            self.inc(f"{name.removesuffix('_seconds')}_total", status=status, **labels)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.start_time = time.time()
+
+    def get_counter(self, name: str, **labels: object) -> float:
+        return sum(
+            value
+            for (counter_name, counter_labels), value in self.counters.items()
+            if counter_name == name
+            and all(pair in counter_labels for pair in to_labels(labels))
+        )
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self.lock:
+            for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({name for name, _ in values}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for (value_name, labels), value in sorted(values.items()):
+                        if value_name == name:
+                            lines.append(f"{name}{format_labels(labels)} {value}")
+
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (hist_name, labels), histogram in sorted(self.histograms.items()):
+                    if hist_name != name:
+                        continue
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        bucket_labels = format_labels(labels, ("le", str(bound)))
+                        lines.append(f"{name}_bucket{bucket_labels} {count}")
+                    inf_labels = format_labels(labels, ("le", "+Inf"))
+                    lines.append(f"{name}_bucket{inf_labels} {histogram.count}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram.total}")
+                    lines.append(
+                        f"{name}_count{format_labels(labels)} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def save_history(self, db_path: str, run_id: str) -> None:
+        finished_at = time.time()
+        with closing(sqlite3.connect(db_path)) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS samples (
+                    run_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    labels TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    count INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS samples_name ON samples(name, run_id);
+                """
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?)",
+                (
+                    run_id,
+                    datetime.fromtimestamp(self.start_time).isoformat(),
+                    datetime.fromtimestamp(finished_at).isoformat(),
+                ),
+            )
+
+            with self.lock:
+                rows = [
+                    (run_id, name, format_labels(labels), "counter", value, None)
+                    for (name, labels), value in self.counters.items()
+                ]
+                rows += [
+                    (run_id, name, format_labels(labels), "gauge", value, None)
+                    for (name, labels), value in self.gauges.items()
+                ]
+                rows += [
+                    (
+                        run_id,
+                        name,
+                        format_labels(labels),
+                        "histogram",
+                        histogram.total,
+                        histogram.count,
+                    )
+                    for (name, labels), histogram in self.histograms.items()
+                ]
+            connection.executemany(
+                "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+            cutoff = (datetime.now() - timedelta(days=HISTORY_DAYS)).isoformat()
+            connection.execute(
+                "DELETE FROM samples WHERE run_id IN "
+                "(SELECT run_id FROM runs WHERE started_at < ?)",
+                (cutoff,),
+            )
+            connection.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,))
+
+
+metrics = Metrics()
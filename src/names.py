@@ -0,0 +1,143 @@
+import re
+from enum import Enum
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+DASHES_RE = re.compile(r"\s*[-‐‑‒–—]\s*")
+CYRILLIC_RE = re.compile(r"[а-яёА-ЯЁәғқңөұүһіӘҒҚҢӨҰҮҺІ]")
+
+LATIN_HOMOGLYPHS = str.maketrans("AaBCcEeHKMOoPpTXxy", "АаВСсЕеНКМОоРрТХху")
+KAZAKH_LETTERS = str.maketrans("әғқңөұүһі", "агкноуухи")
+PATRONYMIC_PARTICLES = {"улы", "уулу", "кызы", "гызы", "оглы"}
+
+
+class MatchKind(Enum):
+    EXACT = "exact"
+    FUZZY = "fuzzy"
+    AMBIGUOUS = "ambiguous"
+    MISSING = "missing"
+
+
+class NameMatch(NamedTuple):
+    kind: MatchKind
+    candidates: List[Tuple[str, Any]]
+
+
+def clean_name(value: str) -> str:
+    value = DASHES_RE.sub("-", " ".join(value.split()))
+    if CYRILLIC_RE.search(value):
+        value = value.translate(LATIN_HOMOGLYPHS)
+    return value
+
+
+def normalize_name(value: str) -> str:
+    return clean_name(value).casefold().replace("ё", "е").translate(KAZAKH_LETTERS)
+
+
+def split_names(value: str) -> Tuple[str, ...]:
+    tokens: List[str] = []
+    for token in clean_name(value).split():
+        if tokens and normalize_name(token) in PATRONYMIC_PARTICLES:
+            tokens[-1] = f"{tokens[-1]} {token}"
+        else:
+            tokens.append(token)
+
+    if len(tokens) > 3:
+        tokens = [" ".join(tokens[:-2]), *tokens[-2:]]
+    return tuple(tokens)
+
+
+def get_ngrams(key: str, size: int = 3) -> Set[str]:
+    padded = f" {key} "
+    return {padded[idx : idx + size] for idx in range(len(padded) - size + 1)}
+
+
+def get_edit_distance(left: str, right: str, max_distance: int) -> int:
+    if abs(len(left) - len(right)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(right) + 1))
+    for left_idx, left_char in enumerate(left, start=1):
+        current = [left_idx]
+        for right_idx, right_char in enumerate(right, start=1):
+            current.append(
+                min(
+                    previous[right_idx] + 1,
+                    current[right_idx - 1] + 1,
+                    previous[right_idx - 1] + (left_char != right_char),
+                )
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def get_max_distance(key: str) -> int:
+    return 1 if len(key) < 12 else 2
+
+
+class NameIndex:
+    def __init__(self, entries: Iterable[Tuple[str, Any]]) -> None:
+        self.entries: List[Tuple[str, Any]] = []
+        self.keys: List[str] = []
+        self.exact: Dict[str, Set[int]] = {}
+        self.unordered: Dict[str, Set[int]] = {}
+        self.short: Dict[str, Set[int]] = {}
+        self.ngrams: Dict[str, Set[int]] = {}
+
+        for idx, (fullname, payload) in enumerate(entries):
+            key = normalize_name(fullname)
+            tokens = key.split()
+            self.entries.append((fullname, payload))
+            self.keys.append(key)
+            self.exact.setdefault(key, set()).add(idx)
+            self.unordered.setdefault(" ".join(sorted(tokens)), set()).add(idx)
+            self.short.setdefault(" ".join(tokens[:2]), set()).add(idx)
+            for ngram in get_ngrams(key):
+                self.ngrams.setdefault(ngram, set()).add(idx)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def to_match(self, ids: Set[int], kind: MatchKind) -> NameMatch:
+        candidates = [self.entries[idx] for idx in sorted(ids)]
+        if len(candidates) > 1:
+            return NameMatch(kind=MatchKind.AMBIGUOUS, candidates=candidates)
+        return NameMatch(kind=kind, candidates=candidates)
+
+    def find_fuzzy(self, key: str, limit: int = 20) -> Optional[Set[int]]:
+        shared: Dict[int, int] = {}
+        for ngram in get_ngrams(key):
+            for idx in self.ngrams.get(ngram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+        closest = sorted(shared, key=lambda idx: shared[idx], reverse=True)[:limit]
+
+        max_distance = get_max_distance(key)
+        best_ids: Set[int] = set()
+        best_distance = max_distance + 1
+        for idx in closest:
+            distance = get_edit_distance(key, self.keys[idx], max_distance)
+            if distance < best_distance:
+                best_ids, best_distance = {idx}, distance
+            elif distance == best_distance:
+                best_ids.add(idx)
+        return best_ids if best_distance <= max_distance else None
+
+    def resolve(self, fullname: str) -> NameMatch:
+        key = normalize_name(fullname)
+        tokens = key.split()
+
+        if ids := self.exact.get(key):
+            return self.to_match(ids, MatchKind.EXACT)
+        if ids := self.unordered.get(" ".join(sorted(tokens))):
+            return self.to_match(ids, MatchKind.EXACT)
+
+        short_key = " ".join(tokens[:2])
+        if len(tokens) <= 2 and (ids := self.short.get(short_key)):
+            return self.to_match(ids, MatchKind.FUZZY)
+        if len(tokens) > 2 and (ids := self.exact.get(short_key)):
+            return self.to_match(ids, MatchKind.FUZZY)
+
+        if ids := self.find_fuzzy(key):
+            return self.to_match(ids, MatchKind.FUZZY)
+        return NameMatch(kind=MatchKind.MISSING, candidates=[])
@@ -10,6 +10,8 @@ import requests
 import requests.adapters
 
 from src.data import Order
+from src.metrics import metrics
+from src.serialization import get_serializer
 
 
 def get_secrets() -> Tuple[str, str]:
@@ -29,7 +31,10 @@ class TelegramAPI:
         self.session = requests.Session()
         self.session.mount("http://", requests.adapters.HTTPAdapter(max_retries=5))
         self.token, self.chat_id = get_secrets()
-        self.api_url = f"https://api.telegram.org/bot{self.token}/"
+        self.api_url = urllib.parse.urljoin(
+            os.getenv("TELEGRAM_API_URL", "https://api.telegram.org/"),
+            f"bot{self.token}/",
+        )
 
     def reload_session(self) -> None:
         self.session = requests.Session()
@@ -50,18 +55,19 @@ class TelegramAPI:
         url = urllib.parse.urljoin(self.api_url, "sendMessage")
         send_data["text"] = message
 
-        if use_session:
-            response = self.session.post(url, data=send_data, files=files)
-        else:
-            response = requests.post(url, data=send_data, files=files)
+        with metrics.timer("telegram_seconds"):
+            if use_session:
+                response = self.session.post(url, data=send_data, files=files)
+            else:
+                response = requests.post(url, data=send_data, files=files)
 
         method = url.split("/")[-1]
-        data = "" if not hasattr(response, "json") else response.json()
-        logging.info(
-            f"Response for '{method}': {response}\n"
-            f"Is 200: {response.status_code == 200}\n"
-            f"Data: {data}"
-        )
+        if response.status_code != 200:
+            logging.warning(
+                f"Response for '{method}': {response.status_code} {response.text}"
+            )
+        elif logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Response for %r: %s", method, response.text)
         response.raise_for_status()
         return response.status_code == 200
 
@@ -93,11 +99,7 @@ class TelegramAPI:
             if isinstance(obj, dict) or isinstance(obj, list):
                 obj_json = json.dumps(obj, ensure_ascii=False, indent=2)
             elif isinstance(obj, Order):
-                obj_json = json.dumps(
-                    obj.as_dict_short(),
-                    indent=2,
-                    ensure_ascii=False,
-                )
+                obj_json = get_serializer(type(obj)).dumps_short(obj)
             else:
                 raise ValueError(f"obj is of the wrong type - {type(obj)}")
 
@@ -1,19 +1,31 @@
+import logging
 import os
 import pickle
 import sys
+import time
+import uuid
 import warnings
-from datetime import datetime
-from typing import List, Type, Callable, Tuple
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+from enum import Enum
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    ContextManager,
+    Iterator,
+    List,
+    Type,
+    Callable,
+    Tuple,
+    NamedTuple,
+    Optional,
+    Set,
+    Dict,
+)
 from urllib.parse import urljoin
 
 import dotenv
 
-from processes import business_trip
-from processes import firing
-from processes import mentorship
-from processes import vacation
-from processes import vacation_add_pay
-from processes import vacation_withdraw
 from src import bpm
 from src import mail
 from src.data import (
@@ -27,10 +39,22 @@ from src.data import (
     Order,
     MentorshipOrder,
     VacationAddPayOrder,
+    get_order_date,
 )
+from src.employee_cache import EmployeeCache
+from src.importtime import lazy_import
+from src.logs import log_context
+from src.metrics import metrics
+from src.names import MatchKind, NameIndex, normalize_name, split_names
 from src.notification import TelegramAPI, handle_error
-from src.utils.colvir_utils import Colvir, ColvirInfo
-from src.utils.utils import create_report, update_report
+from src.scheduler import StageGraph
+from src.sync_state import SyncState, get_order_fingerprint, get_order_key
+from src.utils.process_utils import registry
+from src.utils.retry import FailureKind, classify_failure
+from src.validation import REJECTION_PREFIX, get_rejection_reasons
+
+if TYPE_CHECKING:
+    from src.utils.colvir_utils import Colvir
 
 if sys.version_info.major != 3 or sys.version_info.minor != 12:
     raise RuntimeError(f"Python {sys.version_info} is not supported")
@@ -46,6 +70,10 @@ def get_from_env(key: str) -> str:
     return value
 
 
+def is_env_flag_set(key: str) -> bool:
+    return os.getenv(key, "").strip().lower() in ("1", "true", "yes")
+
+
 def get_processes(
     bpm_base_url: str,
     download_folder: str,
@@ -131,27 +159,146 @@ def get_processes(
     return processes
 
 
-@handle_error
-def run(bot: TelegramAPI) -> None:
-    data_folder = os.path.join(project_folder, "data")
-    os.makedirs(data_folder, exist_ok=True)
+class Job(NamedTuple):
+    process: Process
+    order: Order
+
+
+ProcessCallable = Callable[["Colvir", Process, Order], str]
+
+
+class JobResult(NamedTuple):
+    job: Job
+    report_status: str
+    failed: bool = False
+
+
+PROCESS_DEPENDENCIES: Dict[ProcessType, Tuple[ProcessType, ...]] = {
+    ProcessType.BUSINESS_TRIP: (),
+    ProcessType.VACATION: (),
+    ProcessType.VACATION_WITHDRAW: (ProcessType.VACATION,),
+    ProcessType.FIRING: (
+        ProcessType.BUSINESS_TRIP,
+        ProcessType.VACATION,
+        ProcessType.VACATION_WITHDRAW,
+    ),
+    ProcessType.MENTORSHIP: (),
+    ProcessType.VACATION_ADD_PAY: (ProcessType.VACATION,),
+}
+
+PROCESS_URGENCY_OFFSETS: Dict[ProcessType, int] = {
+    ProcessType.BUSINESS_TRIP: 0,
+    ProcessType.VACATION: 1,
+    ProcessType.VACATION_WITHDRAW: 0,
+    ProcessType.FIRING: 0,
+    ProcessType.MENTORSHIP: 7,
+    ProcessType.VACATION_ADD_PAY: 1,
+}
+UNDATED_ORDER_PRIORITY = 10_000
+
+
+class ScheduleStrategy(Enum):
+    SEQUENTIAL = "sequential"
+    BATCHED = "batched"
+    PARALLEL = "parallel"
+
+
+class RunEnvironment:
+    strategy = ScheduleStrategy.BATCHED
+
+    def __init__(self, data_folder: str) -> None:
+        self.data_folder = data_folder
+
+    @contextmanager
+    def open_bpm(self, bpm_info: bpm.BpmInfo) -> Iterator[bpm.ReportDownloader]:
+        with bpm.driver_init(bpm_info=bpm_info) as driver:
+            yield bpm.ReportDownloader(driver=driver, bpm_info=bpm_info)
+
+    def open_colvir(
+        self, employee_cache: EmployeeCache, resident: bool
+    ) -> ContextManager["Colvir"]:
+        colvir_utils = lazy_import("src.utils.colvir_utils")
+        return colvir_utils.Colvir(
+            colvir_info=colvir_utils.ColvirInfo(
+                location=get_from_env("COLVIR_PATH"),
+                user=get_from_env("COLVIR_USER"),
+                password=get_from_env("COLVIR_PASSWORD"),
+            ),
+            session_path=get_session_path(self.data_folder) if resident else None,
+            employee_cache=employee_cache,
+        )
 
-    today_dt = datetime.now()
-    current_month_name = today_dt.strftime("%B")
+    def prepare_colvir(
+        self, colvir: "Colvir", jobs: List[Job], bot: TelegramAPI
+    ) -> List[Job]:
+        if is_env_flag_set("COLVIR_PERSONNEL_EXPORT"):
+            jobs = resolve_with_personnel(
+                colvir=colvir, data_folder=self.data_folder, jobs=jobs, bot=bot
+            )
+        if os.getenv("COLVIR_ORDER_JOURNAL_MODE"):
+            load_order_journal(colvir=colvir, data_folder=self.data_folder, bot=bot)
+        return jobs
+
+    def get_processor(self, process_type: ProcessType) -> ProcessCallable:
+        return get_processor(process_type)
+
+
+def get_days(start_date: datetime, end_date: datetime) -> List[datetime]:
+    if start_date.date() > end_date.date():
+        raise ValueError(f"start_date {start_date} is after end_date {end_date}")
+    return [
+        start_date + timedelta(days=i)
+        for i in range((end_date.date() - start_date.date()).days + 1)
+    ]
+
+
+def get_day_folders(data_folder: str, day: datetime) -> Tuple[str, str]:
+    month_name = day.strftime("%B")
 
     report_root_folder = os.path.join(
-        data_folder, "reports", str(today_dt.year), current_month_name
+        data_folder, "reports", str(day.year), month_name
     )
     os.makedirs(report_root_folder, exist_ok=True)
 
     download_folder = os.path.join(
         data_folder,
         "downloads",
-        str(today_dt.year),
-        current_month_name,
+        str(day.year),
+        month_name,
     )
     os.makedirs(download_folder, exist_ok=True)
 
+    return report_root_folder, download_folder
+
+
+@handle_error
+def run(
+    bot: TelegramAPI,
+    full_resync: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    time_budget: Optional[float] = None,
+    resident: bool = False,
+    environment: Optional[RunEnvironment] = None,
+) -> None:
+    environment = environment or RunEnvironment(
+        data_folder=os.path.join(project_folder, "data")
+    )
+    deadline = time.monotonic() + time_budget * 60 if time_budget else None
+
+    data_folder = environment.data_folder
+    os.makedirs(data_folder, exist_ok=True)
+
+    sync_state = SyncState(os.path.join(data_folder, "sync_state.json"))
+    registry.load(get_registry_path(data_folder))
+
+    today_dt = datetime.now()
+    start_date = start_date or today_dt
+    end_date = end_date or start_date
+    days = get_days(start_date=start_date, end_date=end_date)
+    days_folders = [get_day_folders(data_folder=data_folder, day=day) for day in days]
+
+    bpm_base_url = get_from_env("BPM_BASE_URL")
     bpm_info = bpm.BpmInfo(
         creds=bpm.CredentialsBPM(
             user=get_from_env("BPM_USER"), password=get_from_env("BPM_PASSWORD")
@@ -160,103 +307,689 @@ def run(bot: TelegramAPI) -> None:
             driver_path=os.path.join(project_folder, get_from_env("DRIVER_PATH")),
             binary_path=os.path.join(project_folder, get_from_env("CHROME_PATH")),
         ),
-        download_folder=download_folder,
-    )
-
-    colvir_info = ColvirInfo(
-        location=get_from_env("COLVIR_PATH"),
-        user=get_from_env("COLVIR_USER"),
-        password=get_from_env("COLVIR_PASSWORD"),
+        download_folder=days_folders[0][1],
+        base_url=urljoin(bpm_base_url, "/"),
+        lightweight=is_env_flag_set("BPM_LIGHTWEIGHT"),
+        profile_folder=(
+            os.path.join(project_folder, os.environ["BPM_PROFILE_PATH"])
+            if os.getenv("BPM_PROFILE_PATH")
+            else None
+        ),
     )
 
-    today = today_dt.strftime("%d.%m.%y")
+    period = days[0].strftime("%d.%m.%y")
+    if len(days) > 1:
+        period = f"{period} - {days[-1].strftime('%d.%m.%y')}"
     bot.send_message(
-        f"Старт процесса за {today}\n"
+        f"Старт процесса за {period}\n"
         f'"Командировки, отпуска, отзывы из отпуска и увольнения"'
     )
 
-    bpm_base_url = get_from_env("BPM_BASE_URL")
-    processes = get_processes(
-        bpm_base_url=bpm_base_url,
-        download_folder=download_folder,
-        report_root_folder=report_root_folder,
-        today=today,
+    days_processes = [
+        get_processes(
+            bpm_base_url=bpm_base_url,
+            download_folder=download_folder,
+            report_root_folder=report_root_folder,
+            today=day.strftime("%d.%m.%y"),
+        )
+        for day, (report_root_folder, download_folder) in zip(days, days_folders)
+    ]
+
+    with environment.open_bpm(bpm_info=bpm_info) as download:
+        for day_idx, (day, processes) in enumerate(zip(days, days_processes)):
+            _, download_folder = days_folders[day_idx]
+            download.set_download_folder(download_folder)
+
+            is_last_day = day_idx == len(days) - 1
+            for process in processes:
+                # Only dated reports differ between days, the others are
+                # downloaded once for the whole range and split by order date
+                if process.process_type in bpm.DATED_PROCESS_TYPES:
+                    day_processes = None
+                elif is_last_day:
+                    name = process.process_type.name.lower()
+                    day_processes = [
+                        getattr(range_processes, name)
+                        for range_processes in days_processes
+                    ]
+                else:
+                    continue
+
+                bpm.run(
+                    process=process,
+                    bot=bot,
+                    download=download,
+                    sync_state=None if full_resync else sync_state,
+                    reuse_csv=day.date() < today_dt.date(),
+                    day_processes=day_processes,
+                )
+
+    employee_cache = EmployeeCache(
+        os.path.join(data_folder, "employee_cache.json"),
+        ttl=timedelta(hours=float(os.getenv("EMPLOYEE_CACHE_TTL_HOURS", "24"))),
     )
 
-    is_logged_in = False
-    with bpm.driver_init(bpm_info=bpm_info) as driver:
-        for process in processes:
-            bpm.run(
-                driver=driver,
-                creds=bpm_info.creds,
-                process=process,
-                bot=bot,
-                is_logged_in=is_logged_in,
-            )
-            is_logged_in = True
+    jobs = collect_jobs(days_processes=days_processes)
+    jobs = reject_invalid_jobs(jobs=jobs, bot=bot)
+    jobs = resolve_employee_names(
+        jobs=jobs, index=NameIndex(employee_cache.get_name_entries()), bot=bot
+    )
+    jobs = prioritize_jobs(jobs=jobs, today=today_dt)
+
+    day_stats: Dict[str, List[float]] = {}
+    skipped_jobs: List[Job] = []
+    logging.info(f"{len(jobs)} - pending orders")
+    if jobs:
+        colvir_context = environment.open_colvir(
+            employee_cache=employee_cache, resident=resident
+        )
+    else:
+        logging.info("No pending orders, skipping Colvir startup")
+        colvir_context = nullcontext()
+
+    with colvir_context as colvir:
+        if jobs:
+            jobs = environment.prepare_colvir(colvir=colvir, jobs=jobs, bot=bot)
+
+        graph = build_stage_graph(
+            jobs=jobs,
+            days_processes=days_processes,
+            colvir=colvir,
+            bot=bot,
+            sync_state=sync_state,
+            day_stats=day_stats,
+            skipped_jobs=skipped_jobs,
+            deadline=deadline,
+            processor_factory=environment.get_processor,
+            strategy=environment.strategy,
+        )
+        graph.run()
 
-    with Colvir(colvir_info=colvir_info) as colvir:
-        process_run(process=processes.business_trip, colvir=colvir, bot=bot)
-        process_run(process=processes.vacation, colvir=colvir, bot=bot)
-        process_run(process=processes.vacation_withdraw, colvir=colvir, bot=bot)
-        process_run(process=processes.firing, colvir=colvir, bot=bot)
-        process_run(process=processes.mentorship, colvir=colvir, bot=bot)
-        process_run(process=processes.vacation_add_pay, colvir=colvir, bot=bot)
+    send_day_stats(bot=bot, day_stats=day_stats)
+    if skipped_jobs:
+        bot.send_message(
+            f"Превышен лимит времени ({time_budget} мин) - "
+            f"{len(skipped_jobs)} - кол-во отложенных приказов"
+        )
+    export_metrics(data_folder=data_folder, graph=graph)
+    stage_summary = graph.summary()
+    logging.info(f"Stage timings:\n{stage_summary}")
+    bot.send_message(stage_summary)
 
     bot.send_message("Успешное окончание процесса")
 
 
-ProcessCallable = Callable[[Colvir, Process, Order], str]
+def export_metrics(data_folder: str, graph: StageGraph) -> None:
+    for stage in graph.stages.values():
+        metrics.observe("stage_seconds", stage.duration, stage=stage.name)
+
+    run_duration = time.time() - metrics.start_time
+    order_count = metrics.get_counter("orders_processed_total")
+    metrics.set("run_duration_seconds", run_duration)
+    metrics.set(
+        "orders_per_hour", order_count / run_duration * 3600 if run_duration else 0.0
+    )
+
+    metrics_folder = os.path.join(data_folder, "metrics")
+    os.makedirs(metrics_folder, exist_ok=True)
+    metrics.write_textfile(os.path.join(metrics_folder, "hr_processes.prom"))
+
+    run_id = datetime.fromtimestamp(metrics.start_time).strftime("%Y%m%d_%H%M%S")
+    metrics.save_history(os.path.join(metrics_folder, "history.sqlite"), run_id=run_id)
+
 
+def get_session_path(data_folder: str) -> str:
+    return os.path.join(data_folder, "colvir_session.json")
 
-def get_order_type_and_processor(
-    process_type: ProcessType,
-) -> Tuple[Type[Order], ProcessCallable]:
+
+def get_registry_path(data_folder: str) -> str:
+    return os.path.join(data_folder, "processes.json")
+
+
+def run_colvir_agent(interval: float) -> None:
+    data_folder = os.path.join(project_folder, "data")
+    os.makedirs(data_folder, exist_ok=True)
+    registry.load(get_registry_path(data_folder))
+
+    colvir_utils = lazy_import("src.utils.colvir_utils")
+    colvir = colvir_utils.Colvir(
+        colvir_info=colvir_utils.ColvirInfo(
+            location=get_from_env("COLVIR_PATH"),
+            user=get_from_env("COLVIR_USER"),
+            password=get_from_env("COLVIR_PASSWORD"),
+        ),
+        session_path=get_session_path(data_folder),
+    )
+    while True:
+        try:
+            colvir.keep_alive()
+        except Exception as e:
+            logging.exception(e)
+        time.sleep(interval * 60)
+
+
+def get_order_type(process_type: ProcessType) -> Type[Order]:
     match process_type:
         case ProcessType.BUSINESS_TRIP:
-            return BusinessTripOrder, business_trip.process_order
+            return BusinessTripOrder
         case ProcessType.VACATION:
-            return VacationOrder, vacation.process_order
+            return VacationOrder
         case ProcessType.VACATION_WITHDRAW:
-            return VacationWithdrawOrder, vacation_withdraw.process_order
+            return VacationWithdrawOrder
         case ProcessType.FIRING:
-            return FiringOrder, firing.process_order
+            return FiringOrder
         case ProcessType.MENTORSHIP:
-            return MentorshipOrder, mentorship.process_order
+            return MentorshipOrder
         case ProcessType.VACATION_ADD_PAY:
-            return VacationAddPayOrder, vacation_add_pay.process_order
+            return VacationAddPayOrder
         case _:
-            ValueError(
+            raise ValueError(
                 f"Unknown process type: ProcessType(name={process_type.name}, value={process_type.value})"
             )
 
 
-def process_run(process: Process, colvir: Colvir, bot: TelegramAPI):
-    order_t, process_order = get_order_type_and_processor(process.process_type)
+def get_processor(process_type: ProcessType) -> ProcessCallable:
+    process_module = lazy_import(f"processes.{process_type.name.lower()}")
+    return process_module.process_order
+
+
+def load_orders(process: Process) -> List[Order]:
+    order_t = get_order_type(process.process_type)
 
     with open(process.pickle_path, "rb") as f:
         orders: List[order_t] = pickle.load(f)
     assert all(isinstance(order, order_t) for order in orders)
 
-    create_report(process.report_path)
+    return orders
+
+
+def get_job_date(job: Job) -> Tuple[bool, datetime]:
+    order_date = get_order_date(job.order)
+    if order_date is None:
+        return True, datetime.min
+    return False, order_date.dt
+
+
+def collect_jobs(days_processes: List[Processes]) -> List[Job]:
+    jobs: List[Job] = []
+    seen_fingerprints: Set[Tuple[ProcessType, str]] = set()
+
+    for processes in days_processes:
+        for process in processes:
+            for order in load_orders(process=process):
+                fingerprint = (process.process_type, get_order_fingerprint(order))
+                if fingerprint in seen_fingerprints:
+                    continue
+                seen_fingerprints.add(fingerprint)
+                jobs.append(Job(process=process, order=order))
+
+    return jobs
+
+
+def reject_invalid_jobs(jobs: List[Job], bot: TelegramAPI) -> List[Job]:
+    reasons = get_rejection_reasons([job.order for job in jobs])
+
+    rejected_results = [
+        JobResult(job=job, report_status=reason)
+        for job, reason in zip(jobs, reasons)
+        if reason is not None
+    ]
+    if rejected_results:
+        write_reports(results=rejected_results)
+
+        rejected_counts: Dict[ProcessType, int] = {}
+        for (process, _), _, _ in rejected_results:
+            rejected_counts[process.process_type] = (
+                rejected_counts.get(process.process_type, 0) + 1
+            )
+        for process_type, rejected_count in rejected_counts.items():
+            bot.send_message(
+                f"{process_type.name} - {rejected_count} - "
+                f"кол-во приказов, не прошедших проверку"
+            )
+
+    return [job for job, reason in zip(jobs, reasons) if reason is None]
+
+
+def resolve_employee_names(
+    jobs: List[Job],
+    index: NameIndex,
+    bot: TelegramAPI,
+    source: str = "cache",
+    is_complete: bool = False,
+) -> List[Job]:
+    if not len(index):
+        return jobs
+
+    resolved_jobs: List[Job] = []
+    rejected_results: List[JobResult] = []
+    for job in jobs:
+        employee_fullname = getattr(job.order, "employee_fullname", None)
+        if not employee_fullname:
+            resolved_jobs.append(job)
+            continue
+
+        match = index.resolve(employee_fullname)
+        metrics.inc(
+            "employee_name_matches_total", result=match.kind.value, source=source
+        )
+        match match.kind:
+            case MatchKind.AMBIGUOUS:
+                fullnames = ", ".join(fullname for fullname, _ in match.candidates)
+                rejected_results.append(
+                    JobResult(
+                        job=job,
+                        report_status=(
+                            f"{REJECTION_PREFIX} Найдено несколько сотрудников "
+                            f'с похожим именем - "{fullnames}"'
+                        ),
+                    )
+                )
+                continue
+            case MatchKind.MISSING if is_complete:
+                rejected_results.append(
+                    JobResult(job=job, report_status="Приказ не найден")
+                )
+                continue
+            case MatchKind.FUZZY if is_complete:
+                fullname, _ = match.candidates[0]
+                rejected_results.append(
+                    JobResult(
+                        job=job,
+                        report_status=(
+                            f"{REJECTION_PREFIX} Сотрудник не найден, "
+                            f'похожее имя - "{fullname}"'
+                        ),
+                    )
+                )
+                continue
+            case MatchKind.FUZZY:
+                fullname, _ = match.candidates[0]
+                logging.info(
+                    f"{employee_fullname!r} is close to {fullname!r}, "
+                    f"looking it up as is"
+                )
+            case MatchKind.EXACT:
+                fullname, _ = match.candidates[0]
+                job.order.employee_names = split_names(fullname)
+        resolved_jobs.append(job)
+
+    if rejected_results:
+        write_reports(results=rejected_results)
+        bot.send_message(
+            f"{len(rejected_results)} - кол-во приказов "
+            f"с неоднозначным или неизвестным именем сотрудника"
+        )
+
+    return resolved_jobs
+
+
+def resolve_with_personnel(
+    colvir: "Colvir", data_folder: str, jobs: List[Job], bot: TelegramAPI
+) -> List[Job]:
+    personnel_folder = os.path.join(data_folder, "personnel")
+    os.makedirs(personnel_folder, exist_ok=True)
+
+    try:
+        with metrics.timer("personnel_export_seconds"):
+            personnel = colvir.load_personnel(work_folder=personnel_folder)
+    except Exception as error:
+        logging.exception(error)
+        try:
+            colvir.reset_state()
+        except Exception:
+            raise error
+        bot.send_message(
+            "Не удалось выгрузить список персонала, "
+            "сотрудники будут найдены через фильтр"
+        )
+        return jobs
+
+    logging.info(f"{len(personnel)} employees loaded from the personnel export")
+    return resolve_employee_names(
+        jobs=jobs,
+        index=personnel.index,
+        bot=bot,
+        source="personnel",
+        is_complete=True,
+    )
+
+
+def load_order_journal(colvir: "Colvir", data_folder: str, bot: TelegramAPI) -> None:
+    journal_folder = os.path.join(data_folder, "order_journal")
+    os.makedirs(journal_folder, exist_ok=True)
+    max_age = float(os.getenv("ORDER_JOURNAL_MAX_AGE_MINUTES", "120")) * 60
+
+    try:
+        with metrics.timer("order_journal_seconds"):
+            journal = colvir.load_order_journal(
+                work_folder=journal_folder,
+                mode=get_from_env("COLVIR_ORDER_JOURNAL_MODE"),
+                max_age=max_age,
+            )
+    except Exception as error:
+        logging.exception(error)
+        try:
+            colvir.reset_state()
+        except Exception:
+            raise error
+        bot.send_message(
+            "Не удалось выгрузить журнал приказов, "
+            "приказы будут проверены по сотрудникам"
+        )
+        return
+
+    logging.info(f"{len(journal)} orders loaded from the order journal")
+
+
+def process_jobs(
+    jobs: List[Job],
+    colvir: "Colvir",
+    bot: TelegramAPI,
+    day_stats: Dict[str, List[float]],
+    skipped_jobs: List[Job],
+    deadline: Optional[float] = None,
+    processor_factory: Callable[[ProcessType], ProcessCallable] = get_processor,
+) -> List[JobResult]:
+    results: List[JobResult] = []
+
+    for idx, job in enumerate(jobs, start=1):
+        if deadline is not None and time.monotonic() > deadline:
+            skipped_jobs.extend(jobs[idx - 1 :])
+            logging.warning(
+                f"Time budget exceeded, skipping {len(jobs) - idx + 1} jobs"
+            )
+            break
+
+        process, order = job
+        process_order = processor_factory(process.process_type)
+
+        order_log_context = log_context(
+            correlation_id=uuid.uuid4().hex[:12],
+            process=process.process_type.name.lower(),
+            order=get_order_key(order),
+        )
+        with order_log_context:
+            start_time = time.perf_counter()
+
+            bot.send_message(bot.to_md(order), use_md=True)
+            failed = False
+            try:
+                report_status = process_order(colvir, process, order)
+            except Exception as error:
+                logging.exception(error)
+                kind = classify_failure(error)
+                if kind is FailureKind.FATAL:
+                    raise
+
+                try:
+                    dialog_text = colvir.reset_state()
+                except Exception:
+                    raise error
+
+                failed = True
+                if dialog_text:
+                    kind = FailureKind.BUSINESS
+                report_status = (
+                    f"{REJECTION_PREFIX} Ошибка Colvir ({kind.value}). "
+                    f'Текст ошибки - "{dialog_text or error}"'
+                )
+                bot.send_message(
+                    f"{process.process_type.name} - приказ пропущен после ошибки "
+                    f"({kind.value}), переход к следующему"
+                )
+            if report_status:
+                results.append(
+                    JobResult(job=job, report_status=report_status, failed=failed)
+                )
+
+            elapsed = time.perf_counter() - start_time
+            process_name = process.process_type.name.lower()
+            metrics.observe("order_seconds", elapsed, process=process_name)
+            metrics.inc(
+                "orders_processed_total",
+                process=process_name,
+                status="failed" if failed else "ok",
+            )
+            stats = day_stats.setdefault(process.today, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            logging.info(
+                f"{idx}/{len(jobs)} - {process.process_type.name} ({process.today}) "
+                f"processed in {elapsed:.1f}s"
+            )
+
+    return results
+
+
+def write_reports(results: List[JobResult]) -> None:
+    report_rows: Dict[str, Tuple[Process, List[Tuple[Order, str, str]]]] = {}
+    for (process, order), report_status, _ in results:
+        _, rows = report_rows.setdefault(process.report_path, (process, []))
+        rows.append((order, "Создание приказа", report_status))
+
+    utils = lazy_import("src.utils.utils")
+    for process, rows in report_rows.values():
+        utils.create_report(process.report_path)
+        utils.update_reports(process=process, results=rows)
+
+
+def materialize_reports(results: List[JobResult], sync_state: SyncState) -> None:
+    with metrics.timer("report_write_seconds"):
+        write_reports(results=results)
+
+    marked_count = 0
+    for (process, order), _, failed in results:
+        if not failed:
+            sync_state.mark(process.process_type, order)
+            marked_count += 1
+    if marked_count:
+        sync_state.save()
+
+
+def send_report(process: Process) -> None:
+    subject = f'Отчет по процессу "{process.process_name}" за {process.today}'
+
+    attachment_path: Optional[str] = process.report_path
+    body: Optional[str] = None
+    if not os.path.exists(process.report_path):
+        attachment_path = None
+        body = f"{subject} - нет новых приказов"
 
     mail_info = mail.Mail(
         server=get_from_env("SMTP_SERVER"),
         sender=get_from_env("SMTP_SENDER"),
         recipients=get_from_env("SMTP_RECIPIENTS"),
-        subject=f'Отчет по процессу "{process.process_name}"',
-        attachment_path=process.report_path,
+        subject=subject,
+        attachment_path=attachment_path,
+        body=body,
+        port=int(os.getenv("SMTP_PORT", "25")),
     )
+    with metrics.timer("mail_seconds"):
+        mail.send_mail(mail_info)
+
+
+def send_process_stats(
+    bot: TelegramAPI, process_type: ProcessType, results: List[JobResult]
+) -> None:
+    bot.send_message(
+        f"{process_type.name} - {len(results)} - кол-во обработанных приказов",
+        use_session=False,
+    )
+
+
+def send_day_stats(bot: TelegramAPI, day_stats: Dict[str, List[float]]) -> None:
+    for today, (order_count, elapsed) in day_stats.items():
+        orders_per_hour = order_count / elapsed * 3600 if elapsed else 0.0
+        bot.send_message(
+            f"{today} - {order_count} - кол-во обработанных приказов, "
+            f"{elapsed:.0f} с, {orders_per_hour:.1f} приказов/час"
+        )
+
 
-    for order in orders:
-        bot.send_message(bot.to_md(order), use_md=True)
-        report_status = process_order(colvir, process, order)
-        if report_status:
-            update_report(
-                order=order,
-                process=process,
-                operation="Создание приказа",
-                status=report_status,
+def get_order_priority(job: Job, today: datetime) -> int:
+    order_date = get_order_date(job.order)
+    if order_date is None:
+        return UNDATED_ORDER_PRIORITY
+    days_left = max((order_date.dt.date() - today.date()).days, 0)
+    return days_left + PROCESS_URGENCY_OFFSETS[job.process.process_type]
+
+
+def get_employee_key(order: Order) -> str:
+    return normalize_name(getattr(order, "employee_fullname", None) or "")
+
+
+def prioritize_jobs(jobs: List[Job], today: datetime) -> List[Job]:
+    type_ranks = {
+        process_type: rank for rank, process_type in enumerate(PROCESS_DEPENDENCIES)
+    }
+
+    job_keys: List[Tuple[int, bool, datetime]] = [
+        (get_order_priority(job=job, today=today), *get_job_date(job)) for job in jobs
+    ]
+
+    employee_keys: Dict[Tuple[str, ProcessType], Tuple[int, bool, datetime]] = {}
+    for job, job_key in zip(jobs, job_keys):
+        key = (get_employee_key(job.order), job.process.process_type)
+        employee_keys[key] = min(employee_keys.get(key, job_key), job_key)
+
+    pulled_keys: Dict[Tuple[str, ProcessType], Tuple[int, bool, datetime]] = {}
+    for process_type in reversed(PROCESS_DEPENDENCIES):
+        for (employee, employee_type), job_key in list(employee_keys.items()):
+            if employee_type != process_type:
+                continue
+            for dependency in PROCESS_DEPENDENCIES[process_type]:
+                key = (employee, dependency)
+                if key in employee_keys and job_key < employee_keys[key]:
+                    employee_keys[key] = job_key
+                    pulled_keys[key] = min(pulled_keys.get(key, job_key), job_key)
+
+    def get_sort_key(
+        item: Tuple[Job, Tuple[int, bool, datetime]],
+    ) -> Tuple[Tuple[int, bool, datetime], int]:
+        job, job_key = item
+        process_type = job.process.process_type
+        pulled_key = pulled_keys.get((get_employee_key(job.order), process_type))
+        if pulled_key is not None:
+            job_key = min(job_key, pulled_key)
+        return job_key, type_ranks[process_type]
+
+    return [job for job, _ in sorted(zip(jobs, job_keys), key=get_sort_key)]
+
+
+def split_into_chunks(jobs: List[Job]) -> List[Tuple[ProcessType, List[Job]]]:
+    chunks: List[Tuple[ProcessType, List[Job]]] = []
+    for job in jobs:
+        process_type = job.process.process_type
+        if not chunks or chunks[-1][0] != process_type:
+            chunks.append((process_type, []))
+        chunks[-1][1].append(job)
+    return chunks
+
+
+def split_by_type(jobs: List[Job]) -> List[Tuple[ProcessType, List[Job]]]:
+    type_jobs: Dict[ProcessType, List[Job]] = {}
+    for job in jobs:
+        type_jobs.setdefault(job.process.process_type, []).append(job)
+    return [
+        (process_type, type_jobs[process_type])
+        for process_type in PROCESS_DEPENDENCIES
+        if process_type in type_jobs
+    ]
+
+
+def build_stage_graph(
+    jobs: List[Job],
+    days_processes: List[Processes],
+    colvir: Optional["Colvir"],
+    bot: TelegramAPI,
+    sync_state: SyncState,
+    day_stats: Dict[str, List[float]],
+    skipped_jobs: List[Job],
+    deadline: Optional[float] = None,
+    processor_factory: Callable[[ProcessType], ProcessCallable] = get_processor,
+    strategy: ScheduleStrategy = ScheduleStrategy.BATCHED,
+) -> StageGraph:
+    def run_colvir_stage(chunk_jobs: List[Job], results: List[JobResult]) -> None:
+        results.extend(
+            process_jobs(
+                jobs=chunk_jobs,
+                colvir=colvir,
+                bot=bot,
+                day_stats=day_stats,
+                skipped_jobs=skipped_jobs,
+                deadline=deadline,
+                processor_factory=processor_factory,
             )
+        )
+
+    def run_report_stage(results: List[JobResult]) -> None:
+        materialize_reports(results=results, sync_state=sync_state)
+
+    def run_mail_stage(type_processes: List[Process]) -> None:
+        for process in type_processes:
+            send_report(process=process)
+
+    is_parallel = strategy == ScheduleStrategy.PARALLEL
+    if is_parallel and colvir is not None and not colvir.is_thread_safe:
+        raise ValueError(
+            "ScheduleStrategy.PARALLEL drives one Colvir session from several "
+            "threads and is only supported with a simulated Colvir"
+        )
+    background = strategy != ScheduleStrategy.SEQUENTIAL
+    graph = StageGraph(max_workers=len(PROCESS_DEPENDENCIES) + 2 if is_parallel else 2)
+
+    type_results: Dict[ProcessType, List[JobResult]] = {
+        process_type: [] for process_type in PROCESS_DEPENDENCIES
+    }
+    chunks = split_by_type(jobs) if is_parallel else split_into_chunks(jobs)
+    last_chunk_stages: Dict[ProcessType, str] = {}
+    previous_stage: Optional[str] = None
+    for idx, (process_type, chunk_jobs) in enumerate(chunks, 1):
+        stage_name = f"colvir:{idx}:{process_type.name.lower()}"
+        if is_parallel:
+            deps = tuple(
+                last_chunk_stages[dependency]
+                for dependency in PROCESS_DEPENDENCIES[process_type]
+                if dependency in last_chunk_stages
+            )
+        else:
+            deps = (previous_stage,) if previous_stage else ()
+        graph.add(
+            stage_name,
+            func=partial(run_colvir_stage, chunk_jobs, type_results[process_type]),
+            deps=deps,
+            background=is_parallel,
+        )
+        previous_stage = stage_name
+        last_chunk_stages[process_type] = stage_name
+
+    for process_type, results in type_results.items():
+        name = process_type.name.lower()
+        type_processes = [getattr(processes, name) for processes in days_processes]
+        colvir_deps = (
+            (last_chunk_stages[process_type],)
+            if process_type in last_chunk_stages
+            else ()
+        )
+
+        graph.add(
+            f"report:{name}",
+            func=partial(run_report_stage, results),
+            deps=colvir_deps,
+            background=background,
+        )
+        graph.add(
+            f"mail:{name}",
+            func=partial(run_mail_stage, type_processes),
+            deps=(f"report:{name}",),
+            background=background,
+        )
+        graph.add(
+            f"telegram:{name}",
+            func=partial(send_process_stats, bot, process_type, results),
+            deps=colvir_deps,
+            background=background,
+        )
 
-    mail.send_mail(mail_info)
+    return graph
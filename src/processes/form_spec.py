@@ -0,0 +1,163 @@
+from time import sleep
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from src.data import Order, Process
+from src.employee_cache import STATUS_CHANGING_TYPES
+from src.metrics import metrics
+from src.utils.colvir_utils import Colvir, FormField
+
+
+class PostDialog(NamedTuple):
+    title: str
+    get_fields: Callable[[Order], List[FormField]]
+    accept_button: str = "Принять"
+
+
+class FormSpec(NamedTuple):
+    mode: Optional[str] = None
+    get_fields: Callable[[Order], List[FormField]] = lambda order: []
+    validate: Optional[Callable[[Order], Optional[str]]] = None
+    post_dialogs: Tuple[PostDialog, ...] = ()
+    get_success_status: Callable[[Order], str] = lambda order: "Приказ создан"
+    mode_control: str = "Edit18"
+
+
+def create_new_entry(colvir: Colvir, order: Order, spec: FormSpec) -> Optional[str]:
+    if spec.mode is None:
+        return None
+
+    order_win = colvir.utils.get_window(title="Приказ")
+
+    order_win[spec.mode_control].type_keys(spec.mode, pause=0.1)
+    order_win[spec.mode_control].type_keys("{TAB}")
+    sleep(0.5)
+    if (error_win := colvir.app.window(title="Произошла ошибка")).exists():
+        error_win.close()
+        order_win["Edit38"].type_keys("{TAB}")
+
+    report_status = colvir.fill_form(win=order_win, fields=spec.get_fields(order))
+    if report_status:
+        colvir.close_entry_without_saving(order_win=order_win)
+        return report_status
+
+    colvir.find_and_click_button(
+        button=colvir.buttons.order_save,
+        window=order_win,
+        toolbar=order_win["Static3"],
+        target_button_name="Сохранить изменения (PgDn)",
+    )
+    return None
+
+
+def fill_post_dialog(
+    colvir: Colvir, order: Order, post_dialog: PostDialog
+) -> Optional[str]:
+    dialog_win = colvir.app.window(title=post_dialog.title)
+    if not dialog_win.exists():
+        return None
+
+    if not dialog_win.has_focus():
+        dialog_win.set_focus()
+
+    report_status = colvir.fill_form(
+        win=dialog_win, fields=post_dialog.get_fields(order)
+    )
+    if report_status:
+        return report_status
+
+    dialog_win[post_dialog.accept_button].click()
+
+    sleep(1)
+
+    error_win = colvir.app.window(title="Произошла ошибка")
+    if error_win.exists():
+        error_msg = error_win.child_window(class_name="Edit").window_text()
+        error_win.close()
+        return (
+            f"Не удалось ИСПОЛНИТЬ приказ. Требуется проверка специалистом. "
+            f'Текст ошибки - "{error_msg}"'
+        )
+    return None
+
+
+def process_order(
+    colvir: Colvir, process: Process, order: Order, spec: FormSpec
+) -> str:
+    with metrics.timer("colvir_step_seconds", step="order_status"):
+        personal_win, orders_win, report_status = (
+            colvir.process_employee_order_status(process=process, order=order)
+        )
+    if report_status:
+        return report_status
+
+    assert personal_win is not None and orders_win is not None
+
+    with metrics.timer("colvir_step_seconds", step="employee_card"):
+        report_status = colvir.process_employee_card(order)
+    if report_status:
+        orders_win.close()
+        personal_win.close()
+        return report_status
+
+    assert (
+        order.branch_num is not None
+        and order.tab_num is not None
+        and order.employee_status is not None
+    )
+
+    if spec.validate is not None and (report_status := spec.validate(order)):
+        orders_win.close()
+        personal_win.close()
+        return report_status
+
+    if process.process_type in STATUS_CHANGING_TYPES or order.employee_status in (
+        "В командировке",
+        "В отпуске",
+    ):
+        colvir.forget_employee(order)
+
+    personal_win.set_focus()
+    if order.employee_status == "В командировке":
+        colvir.return_from("Возврат из командировки", personal_win)
+    elif order.employee_status == "В отпуске":
+        colvir.return_from("Возврат из отпуска", personal_win)
+
+    orders_win.set_focus()
+    sleep(1)
+    orders_win.wait(wait_for="active enabled")
+
+    colvir.find_and_click_button(
+        button=colvir.buttons.create_new_order,
+        window=orders_win,
+        toolbar=orders_win["Static4"],
+        target_button_name="Создать новую запись (Ins)",
+    )
+
+    with metrics.timer("colvir_step_seconds", step="create_entry"):
+        report_status = create_new_entry(colvir=colvir, order=order, spec=spec)
+    if report_status:
+        orders_win.close()
+        personal_win.close()
+        return report_status
+
+    orders_win.wait(wait_for="active enabled")
+
+    with metrics.timer("colvir_step_seconds", step="confirm_entry"):
+        report_status = colvir.confirm_new_entry(orders_win=orders_win)
+    colvir.remember_order(process=process, order=order)
+    if report_status:
+        orders_win.close()
+        personal_win.close()
+        return report_status
+
+    for post_dialog in spec.post_dialogs:
+        with metrics.timer("colvir_step_seconds", step="post_dialog"):
+            report_status = fill_post_dialog(
+                colvir=colvir, order=order, post_dialog=post_dialog
+            )
+        if report_status:
+            return report_status
+
+    orders_win.close()
+    personal_win.close()
+    return spec.get_success_status(order)
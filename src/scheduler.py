@@ -0,0 +1,136 @@
+import contextvars
+import dataclasses
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclasses.dataclass(slots=True)
+class Stage:
+    name: str
+    func: Callable[[], Any]
+    deps: Tuple[str, ...] = ()
+    background: bool = False
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+
+class StageGraph:
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        deps: Tuple[str, ...] = (),
+        background: bool = False,
+    ) -> Stage:
+        if name in self.stages:
+            raise ValueError(f"Stage {name!r} is already defined")
+        stage = Stage(name=name, func=func, deps=deps, background=background)
+        self.stages[name] = stage
+        return stage
+
+    def topological_order(self) -> List[Stage]:
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(
+                        f"Stage {stage.name!r} depends on unknown stage {dep!r}"
+                    )
+
+        ordered: List[Stage] = []
+        done = set()
+        pending = list(self.stages.values())
+        while pending:
+            ready = [s for s in pending if all(dep in done for dep in s.deps)]
+            if not ready:
+                names = [s.name for s in pending]
+                raise ValueError(f"Stage graph has a cycle between {names}")
+            stage = next((s for s in ready if s.background), ready[0])
+            ordered.append(stage)
+            done.add(stage.name)
+            pending.remove(stage)
+        return ordered
+
+    @staticmethod
+    def run_stage(stage: Stage, dep_futures: List[Future]) -> Any:
+        for dep_future in dep_futures:
+            dep_future.result()
+
+        stage.start_time = time.perf_counter()
+        try:
+            return stage.func()
+        finally:
+            stage.end_time = time.perf_counter()
+            logging.info(f"Stage {stage.name} finished in {stage.duration:.2f}s")
+
+    def run(self) -> None:
+        ordered = self.topological_order()
+        futures: Dict[str, Future] = {}
+
+        self.start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for stage in ordered:
+                dep_futures = [futures[dep] for dep in stage.deps]
+                if stage.background:
+                    futures[stage.name] = executor.submit(
+                        contextvars.copy_context().run,
+                        self.run_stage,
+                        stage,
+                        dep_futures,
+                    )
+                    continue
+
+                future: Future = Future()
+                future.set_result(self.run_stage(stage, dep_futures))
+                futures[stage.name] = future
+
+            for future in futures.values():
+                future.result()
+        self.end_time = time.perf_counter()
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        lengths: Dict[str, float] = {}
+        parents: Dict[str, Optional[str]] = {}
+
+        for stage in self.topological_order():
+            parent = max(stage.deps, key=lambda dep: lengths[dep], default=None)
+            parents[stage.name] = parent
+            parent_length = lengths[parent] if parent else 0.0
+            lengths[stage.name] = stage.duration + parent_length
+
+        if not lengths:
+            return [], 0.0
+
+        name: Optional[str] = max(lengths, key=lambda key: lengths[key])
+        length = lengths[name]
+        path: List[str] = []
+        while name is not None:
+            path.append(name)
+            name = parents[name]
+        return path[::-1], length
+
+    def summary(self) -> str:
+        wall_time = 0.0
+        if self.start_time is not None and self.end_time is not None:
+            wall_time = self.end_time - self.start_time
+
+        path, length = self.critical_path()
+        lines = [
+            f"{stage.name} - {stage.duration:.1f} с" for stage in self.stages.values()
+        ]
+        lines.append(f"Общее время - {wall_time:.1f} с")
+        lines.append(f"Критический путь - {length:.1f} с ({' -> '.join(path)})")
+        return "\n".join(lines)
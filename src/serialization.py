@@ -0,0 +1,128 @@
+import dataclasses
+import json
+import typing
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from src.data import Date, Order
+
+COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+HUMAN_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def is_date_field(annotation: Any) -> bool:
+    if annotation is Date:
+        return True
+    return Date in typing.get_args(annotation)
+
+
+def is_tuple_field(annotation: Any) -> bool:
+    if typing.get_origin(annotation) is tuple:
+        return True
+    return any(typing.get_origin(arg) is tuple for arg in typing.get_args(annotation))
+
+
+def load_date(value: Optional[Dict[str, str]]) -> Optional[Date]:
+    if value is None:
+        return None
+    return Date(datetime.fromisoformat(value["dt"]))
+
+
+def load_tuple(value: Optional[List[Any]]) -> Optional[Tuple[Any, ...]]:
+    if value is None:
+        return None
+    return tuple(value)
+
+
+def compile_function(name: str, lines: List[str], namespace: Dict[str, Any]) -> Any:
+    source = "\n".join(lines)
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    return namespace[name]
+
+
+class OrderSerializer:
+    def __init__(self, order_t: Type[Order]) -> None:
+        self.order_t = order_t
+
+        hints = typing.get_type_hints(order_t)
+        self.fields = [
+            (field.name, is_date_field(hints[field.name]))
+            for field in dataclasses.fields(order_t)
+            if field.metadata.get("serialize", True)
+        ]
+        self.tuple_fields = {
+            field.name
+            for field in dataclasses.fields(order_t)
+            if is_tuple_field(hints[field.name])
+        }
+        self.short_fields = [
+            (field.name, is_date_field(hints[field.name]))
+            for field in dataclasses.fields(order_t)
+            if field.metadata.get("serialize", True)
+            and field.metadata.get("short", True)
+        ]
+
+        self.to_dict: Callable[[Order], Dict[str, Any]] = self.compile_to_dict(
+            "to_dict", self.fields, "as_dict()"
+        )
+        self.to_short_dict: Callable[[Order], Dict[str, Any]] = self.compile_to_dict(
+            "to_short_dict", self.short_fields, "short"
+        )
+        self.from_dict: Callable[[Dict[str, Any]], Order] = self.compile_from_dict()
+
+    @staticmethod
+    def compile_to_dict(name: str, fields: List[Any], date_attr: str) -> Any:
+        lines = [f"def {name}(order):", "    return {"]
+        for field_name, is_date in fields:
+            value = f"order.{field_name}"
+            if is_date:
+                value = f"None if {value} is None else {value}.{date_attr}"
+            lines.append(f"        {field_name!r}: {value},")
+        lines.append("    }")
+        return compile_function(name, lines, {})
+
+    def compile_from_dict(self) -> Any:
+        lines = ["def from_dict(data):", "    return order_t("]
+        for field_name, is_date in self.fields:
+            value = f"data[{field_name!r}]"
+            if is_date:
+                value = f"load_date({value})"
+            elif field_name in self.tuple_fields:
+                value = f"load_tuple({value})"
+            lines.append(f"        {field_name}={value},")
+        lines.append("    )")
+        return compile_function(
+            "from_dict",
+            lines,
+            {"order_t": self.order_t, "load_date": load_date, "load_tuple": load_tuple},
+        )
+
+    def dumps(self, order: Order) -> str:
+        return COMPACT_ENCODER.encode(self.to_dict(order))
+
+    def dumps_short(self, order: Order) -> str:
+        return HUMAN_ENCODER.encode(self.to_short_dict(order))
+
+    def loads(self, text: str) -> Order:
+        return self.from_dict(json.loads(text))
+
+
+serializers: Dict[type, OrderSerializer] = {}
+
+
+def get_serializer(order_t: Type[Order]) -> OrderSerializer:
+    serializer = serializers.get(order_t)
+    if serializer is None:
+        serializer = serializers.setdefault(order_t, OrderSerializer(order_t))
+    return serializer
+
+
+def dumps_orders(orders: Iterable[Order]) -> str:
+    return COMPACT_ENCODER.encode(
+        [get_serializer(type(order)).to_dict(order) for order in orders]
+    )
+
+
+def loads_orders(order_t: Type[Order], text: str) -> List[Order]:
+    from_dict = get_serializer(order_t).from_dict
+    return [from_dict(data) for data in json.loads(text)]
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Any
+
+from src.data import (
+    Date,
+    Order,
+    ProcessType,
+    BusinessTripOrder,
+    VacationOrder,
+    VacationWithdrawOrder,
+    FiringOrder,
+    MentorshipOrder,
+    VacationAddPayOrder,
+)
+
+
+def format_key_value(value: Any) -> str:
+    if isinstance(value, Date):
+        value = value.dt
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return "" if value is None else str(value).strip()
+
+
+def get_key_dates(order: Order) -> List[Any]:
+    match order:
+        case BusinessTripOrder():
+            return [
+                order.sign_date,
+                order.start_date,
+                order.end_date,
+                order.main_order_start_date,
+            ]
+        case VacationOrder():
+            return [order.start_date, order.end_date]
+        case VacationWithdrawOrder():
+            return [order.withdraw_date]
+        case FiringOrder():
+            return [order.firing_date]
+        case MentorshipOrder():
+            return [
+                order.mentorship_start_date,
+                order.mentorship_end_date,
+                order.creation_date,
+            ]
+        case VacationAddPayOrder():
+            return [order.date]
+        case _:
+            raise ValueError(f"Order is of unknown type - {type(order)}")
+
+
+def get_order_key(order: Order) -> str:
+    order_number = getattr(order, "order_number", None) or getattr(
+        order, "mentrorship_order_number", None
+    )
+    employee_fullname = getattr(order, "employee_fullname", None)
+    return "|".join(
+        [format_key_value(order_number), format_key_value(employee_fullname)]
+    )
+
+
+def get_order_fingerprint(order: Order) -> str:
+    values = [get_order_key(order)] + [
+        format_key_value(date) for date in get_key_dates(order)
+    ]
+    return hashlib.sha1("|".join(values).encode("utf-8")).hexdigest()
+
+
+class SyncState:
+    def __init__(self, state_path: str) -> None:
+        self.state_path = state_path
+        self.fingerprints: Dict[str, Dict[str, str]] = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.fingerprints = json.load(f)
+
+    def is_new(self, process_type: ProcessType, order: Order) -> bool:
+        known_fingerprints = self.fingerprints.get(process_type.name, {})
+        known_fingerprint = known_fingerprints.get(get_order_key(order))
+        return known_fingerprint != get_order_fingerprint(order)
+
+    def filter_new(
+        self, process_type: ProcessType, orders: List[Order]
+    ) -> List[Order]:
+        return [order for order in orders if self.is_new(process_type, order)]
+
+    def mark(self, process_type: ProcessType, order: Order) -> None:
+        with self.lock:
+            known_fingerprints = self.fingerprints.setdefault(process_type.name, {})
+            known_fingerprints[get_order_key(order)] = get_order_fingerprint(order)
+
+    def save(self) -> None:
+        with self.lock:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.fingerprints, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
@@ -1,38 +1,66 @@
 import dataclasses
+import json
+import logging
 import os
 import random
 import re
-from datetime import timedelta
+from datetime import date, datetime, timedelta
 from time import sleep
-from typing import Optional, Tuple, cast, List, Union, NamedTuple
+from typing import Dict, Optional, Set, Tuple, List, NamedTuple
 
-import pandas as pd
-import psutil
 import pyautogui
 import pyperclip
 import pywinauto
 import pywinauto.timings
 import win32con
 import win32gui
-from attr import define
+import win32process
 from pywinauto import mouse, win32functions, ElementNotFoundError
 
-from src.data import (
-    Date,
-    Order,
-    Process,
-    BusinessTripOrder,
-    VacationOrder,
-    VacationWithdrawOrder,
-    FiringOrder,
-    MentorshipOrder,
-    VacationAddPayOrder,
+from src.data import Date, Order, Process, get_order_date
+from src.employee_cache import EmployeeCache, EmployeeRecord, PersonnelTable
+from src.importtime import lazy_import
+from src.names import clean_name, normalize_name
+from src.utils import order_export
+from src.utils.dialog_utils import (
+    DialogContent,
+    DialogInspector,
+    parse_dialog_content,
 )
-from src.utils.excel_utils import xls_to_xlsx
+from src.utils.process_utils import (
+    find_children,
+    find_processes,
+    is_pid_running,
+    is_started_after,
+    registry,
+)
+from src.utils.retry import (
+    BusinessError,
+    FailureKind,
+    RetryPolicy,
+    TransientError,
+    classify_failure,
+    retry_step,
+)
+from src.validation import REJECTION_PREFIX
 
 pyautogui.FAILSAFE = False
 
 
+def find_window_pids(class_name: str, title_re: re.Pattern) -> Set[int]:
+    pids: Set[int] = set()
+
+    def callback(handle: int, _) -> bool:
+        if win32gui.GetClassName(handle) == class_name and title_re.search(
+            win32gui.GetWindowText(handle)
+        ):
+            pids.add(win32process.GetWindowThreadProcessId(handle)[1])
+        return True
+
+    win32gui.EnumWindows(callback, None)
+    return pids
+
+
 class ColvirInfo(NamedTuple):
     location: str
     user: str
@@ -59,31 +87,27 @@ class Buttons:
     cities_menu: Button = dataclasses.field(default_factory=Button)
 
 
-@define
-class DialogContent:
-    title: Optional[str]
-    content: Optional[str]
-    button_names: List[str]
-
-    def __getitem__(self, item: str):
-        return getattr(self, item)
+class FormField(NamedTuple):
+    control: str
+    value: str
+    typed: bool = False
+    trigger: bool = False
+    error: Optional[str] = None
+    verify: bool = True
 
-    def __setitem__(self, key: str, value: Union[Optional[str], List[str]]):
-        setattr(self, key, value)
 
-
-def kill_all_processes(proc_name: str) -> None:
-    for proc in psutil.process_iter():
-        try:
-            if proc_name in proc.name():
-                proc.terminate()
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            continue
+@dataclasses.dataclass(slots=True)
+class WindowCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
 
 
 class ColvirUtils:
     def __init__(self, app: Optional[pywinauto.Application]):
         self.app = app
+        self.window_handles: Dict[Tuple[str, bool, int], int] = {}
+        self.window_cache_stats: Dict[str, WindowCacheStats] = {}
 
     @staticmethod
     def wiggle_mouse(duration: int) -> None:
@@ -134,21 +158,22 @@ class ColvirUtils:
         win32functions.WaitGuiThreadIdle(handle)
 
     @staticmethod
-    def set_focus(win: pywinauto.WindowSpecification, retries: int = 20) -> None:
-        while retries > 0:
+    def set_focus(win: pywinauto.WindowSpecification, retries: int = 6) -> None:
+        policy = RetryPolicy(attempts=retries, backoff=0.25, max_backoff=2.0)
+        for attempt in range(1, retries + 1):
             try:
-                if retries % 2 == 0:
+                if attempt % 2 == 1:
                     ColvirUtils.set_focus_win32(win)
                 else:
                     win.set_focus()
-                break
-            except (Exception, BaseException):
-                retries -= 1
-                sleep(5)
-                continue
-
-        if retries <= 0:
-            raise Exception("Failed to set focus")
+                return
+            except Exception as error:
+                kind = classify_failure(error)
+                if kind is FailureKind.MISSING_WINDOW and not win.exists():
+                    raise
+                if attempt == retries:
+                    raise TransientError("Failed to set focus") from error
+                sleep(policy.get_delay(attempt))
 
     @staticmethod
     def press(win: pywinauto.WindowSpecification, key: str, pause: float = 0) -> None:
@@ -181,14 +206,53 @@ class ColvirUtils:
         regex: bool = False,
         found_index: int = 0,
     ) -> pywinauto.WindowSpecification:
+        key = (title, regex, found_index)
+        stats = self.window_cache_stats.setdefault(title, WindowCacheStats())
+
+        handle = self.window_handles.get(key)
+        if handle is not None:
+            if self.is_cached_window_valid(handle=handle, title=title, regex=regex):
+                stats.hits += 1
+                window = self.app.window(handle=handle)
+                if wait_for != "exists":
+                    window.wait(wait_for=wait_for, timeout=timeout)
+                return window
+            del self.window_handles[key]
+            stats.invalidations += 1
+
+        stats.misses += 1
         if regex:
             window = self.app.window(title_re=title, found_index=found_index)
         else:
             window = self.app.window(title=title, found_index=found_index)
         window.wait(wait_for=wait_for, timeout=timeout)
+        self.window_handles[key] = window.wrapper_object().handle
         sleep(0.5)
         return window
 
+    @staticmethod
+    def is_cached_window_valid(handle: int, title: str, regex: bool) -> bool:
+        if not (
+            win32gui.IsWindow(handle)
+            and win32gui.IsWindowVisible(handle)
+            and win32gui.IsWindowEnabled(handle)
+        ):
+            return False
+        window_title = win32gui.GetWindowText(handle)
+        if regex:
+            return re.match(title, window_title) is not None
+        return window_title == title
+
+    def invalidate_window_cache(self) -> None:
+        self.window_handles.clear()
+
+    def window_cache_summary(self) -> str:
+        return "\n".join(
+            f"{title}: hits={stats.hits}, misses={stats.misses}, "
+            f"invalidations={stats.invalidations}"
+            for title, stats in self.window_cache_stats.items()
+        )
+
     def persistent_win_exists(self, title_re: str, timeout: float) -> bool:
         try:
             self.app.window(title_re=title_re).wait(wait_for="enabled", timeout=timeout)
@@ -203,26 +267,169 @@ class ColvirUtils:
         dialog_win["OK"].click_input()
 
 
+class ColvirSession(NamedTuple):
+    pid: int
+    started_at: str
+
+
+def load_session(session_path: str) -> Optional[ColvirSession]:
+    if not os.path.exists(session_path):
+        return None
+    try:
+        with open(session_path, "r", encoding="utf-8") as f:
+            return ColvirSession(**json.load(f))
+    except (ValueError, TypeError):
+        return None
+
+
+def save_session(session_path: str, session: ColvirSession) -> None:
+    tmp_path = f"{session_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(session._asdict(), f)
+    os.replace(tmp_path, session_path)
+
+
 class Colvir:
-    def __init__(self, colvir_info: ColvirInfo) -> None:
-        kill_all_processes(proc_name="COLVIR")
+    is_thread_safe = False
+
+    def __init__(
+        self,
+        colvir_info: ColvirInfo,
+        session_path: Optional[str] = None,
+        employee_cache: Optional[EmployeeCache] = None,
+    ) -> None:
+        if session_path is None:
+            registry.terminate("COLVIR")
         self.info = colvir_info
+        self.session_path = session_path
+        self.employee_cache = employee_cache
+        self.personnel: Optional[PersonnelTable] = None
+        self.order_journal: Optional[order_export.OrderJournal] = None
         self.app: Optional[pywinauto.Application] = None
         self.utils = ColvirUtils(app=self.app)
         self.buttons = Buttons()
+        self.oper_day: Optional[date] = None
+        self.dialog_inspector = DialogInspector(
+            title="Colvir Banking System",
+            find_window=self.find_dialog,
+            read_controls=self.read_dialog_controls,
+            read_clipboard=self.read_dialog_clipboard,
+        )
 
     def open_colvir(self) -> None:
         for _ in range(10):
             try:
                 self.app = pywinauto.Application().start(cmd_line=self.info.location)
+                registry.register("COLVIR", self.app.process)
                 self.login()
                 self.check_interactivity()
                 break
             except pywinauto.findwindows.ElementNotFoundError:
-                kill_all_processes("COLVIR")
+                registry.terminate("COLVIR")
                 continue
         assert self.app is not None, Exception("max_retries exceeded")
         self.utils.app = self.app
+        self.utils.invalidate_window_cache()
+
+        if self.session_path is not None:
+            save_session(
+                self.session_path,
+                ColvirSession(
+                    pid=self.app.process, started_at=datetime.now().isoformat()
+                ),
+            )
+
+    def is_session_alive(self) -> bool:
+        return self.app.is_process_running() and self.app.window(
+            title_re="Банковская система.+"
+        ).exists(timeout=1)
+
+    def close_child_windows(self) -> None:
+        main_win = self.app.window(title_re="Банковская система.+").wrapper_object()
+        for _ in range(3):
+            child_wins = [
+                win
+                for win in self.app.windows(visible_only=True)
+                if win.handle != main_win.handle
+            ]
+            if not child_wins:
+                break
+            for win in child_wins:
+                win.close()
+                confirm_win = self.app.window(title="Подтверждение")
+                if confirm_win.exists():
+                    confirm_win["&Нет"].click()
+        self.utils.invalidate_window_cache()
+
+    def reset_state(self) -> Optional[str]:
+        if self.app is None or not self.is_session_alive():
+            raise RuntimeError("Colvir is not running")
+
+        dialog_text = self.dialog_text()
+        self.close_child_windows()
+        return dialog_text
+
+    def attach_colvir(self) -> bool:
+        session = load_session(self.session_path)
+        if session is None:
+            return False
+
+        try:
+            self.app = pywinauto.Application().connect(process=session.pid, timeout=5)
+        except (
+            pywinauto.application.ProcessNotFoundError,
+            pywinauto.timings.TimeoutError,
+        ):
+            logging.info(f"Colvir session {session.pid} is gone")
+            return False
+
+        self.utils.app = self.app
+        self.utils.invalidate_window_cache()
+        registry.register("COLVIR", session.pid)
+
+        try:
+            if self.app.window(title="Вход в систему").exists():
+                logging.info(f"Colvir session {session.pid} expired, logging in")
+                self.login()
+            if not self.is_session_alive():
+                raise pywinauto.findwindows.ElementNotFoundError()
+            self.close_child_windows()
+        except (pywinauto.findwindows.ElementNotFoundError, RuntimeError):
+            logging.info(f"Colvir session {session.pid} is unusable")
+            registry.terminate("COLVIR", pids={session.pid})
+            self.app = None
+            return False
+
+        logging.info(f"Attached to Colvir session {session.pid}")
+        return True
+
+    @property
+    def busy_path(self) -> str:
+        return f"{self.session_path}.busy"
+
+    def is_busy(self) -> bool:
+        if not os.path.exists(self.busy_path):
+            return False
+        with open(self.busy_path, "r", encoding="utf-8") as f:
+            busy_pid = f.read().strip()
+        return busy_pid.isdigit() and is_pid_running(int(busy_pid))
+
+    def keep_alive(self) -> None:
+        if self.is_busy():
+            return
+        if self.app is None or not self.app.is_process_running():
+            self.ensure_session()
+            return
+        if self.app.window(title="Вход в систему").exists():
+            logging.info("Colvir session expired, logging in")
+            self.login()
+
+    def ensure_session(self) -> None:
+        if self.session_path is not None and self.attach_colvir():
+            return
+        if self.session_path is not None:
+            registry.terminate("COLVIR")
+        self.open_colvir()
 
     def login(self) -> None:
         login_win = self.app.window(title="Вход в систему")
@@ -253,6 +460,12 @@ class Colvir:
         reports_win = self.app.window(title="Выбор отчета")
         self.utils.close_window(win=reports_win, raise_error=True)
 
+    def raise_for_dialog(self) -> None:
+        dialog_text = self.dialog_text()
+        if dialog_text is not None:
+            raise BusinessError(dialog_text)
+
+    @retry_step("choose_mode", check=raise_for_dialog)
     def choose_mode(self, mode: str) -> None:
         mode_win = self.app.window(title="Выбор режима")
         mode_win["Edit2"].set_text(text=mode)
@@ -267,48 +480,103 @@ class Colvir:
 
     @staticmethod
     def parse_dialog_content(dialog_text: str) -> DialogContent:
-        lines = list(filter(lambda l: l, dialog_text.split("\r\n")))
-
-        dialog_content = DialogContent(title=None, content=None, button_names=[])
-
-        section = None
-        for line in lines:
-            if line.startswith("[Window Title]"):
-                section = "title"
-            elif line.startswith("[Content]"):
-                section = "content"
-            elif (
-                line.startswith("[OK]")
-                or line.startswith("[Cancel]")
-                or line.startswith("[")
-            ):
-                dialog_content.button_names.append(line.strip("[]"))
-            else:
-                if section:
-                    dialog_content[section] = line
-                    section = None
-
-        return dialog_content
+        return parse_dialog_content(dialog_text=dialog_text)
 
-    def dialog_text(self) -> Optional[str]:
-        dialog_win = self.app.window(title="Colvir Banking System", found_index=0)
-        if not dialog_win.exists():
-            return None
+    def find_dialog(self, title: str) -> int:
+        handle = win32gui.FindWindow(None, title)
+        if not handle:
+            return 0
+        _, process_id = win32process.GetWindowThreadProcessId(handle)
+        return handle if process_id == self.app.process else 0
 
+    @staticmethod
+    def read_dialog_controls(handle: int) -> List[Tuple[str, str]]:
+        # Task dialogs draw their text in a DirectUIHWND without Static children,
+        # only UI Automation exposes it
+        uia_element_info = lazy_import("pywinauto.uia_element_info")
+        dialog_info = uia_element_info.UIAElementInfo(handle)
+        return [
+            (element.control_type, element.name)
+            for element in dialog_info.descendants()
+            if element.parent.control_type != "TitleBar"
+        ]
+
+    def read_dialog_clipboard(self, handle: int) -> str:
+        dialog_win = self.app.window(handle=handle)
         if not dialog_win.has_focus():
             dialog_win.set_focus()
             sleep(0.5)
 
         dialog_win.type_keys("^C")
         sleep(0.5)
-        dialog_text = pyperclip.paste()
+        return pyperclip.paste()
+
+    def dialog_text(self) -> Optional[str]:
+        inspection = self.dialog_inspector.inspect()
+        if inspection is None:
+            return None
 
-        dialog_content = self.parse_dialog_content(dialog_text=dialog_text)
+        handle, dialog_content = inspection
         dialog_content_text = dialog_content.content
         if dialog_content_text is not None:
-            dialog_win.close()
+            self.app.window(handle=handle).close()
         return dialog_content_text
 
+    @staticmethod
+    def set_field(control: pywinauto.WindowSpecification, field: FormField) -> None:
+        if field.typed:
+            control.set_edit_text("")
+            control.type_keys(field.value, with_spaces=True, set_foreground=False)
+        else:
+            control.set_edit_text(field.value)
+
+    def fill_form(
+        self, win: pywinauto.WindowSpecification, fields: List[FormField]
+    ) -> Optional[str]:
+        handle = win.wrapper_object().handle
+        win32functions.WaitGuiThreadIdle(handle)
+
+        for field in fields:
+            control = win[field.control]
+            self.set_field(control=control, field=field)
+
+            if not field.trigger:
+                continue
+
+            control.type_keys("{TAB}")
+            win32functions.WaitGuiThreadIdle(handle)
+
+            if field.error is None:
+                continue
+            dialog_text = self.dialog_text()
+            if dialog_text is not None:
+                return (
+                    f"{REJECTION_PREFIX} {field.error}. "
+                    f'Текст ошибки - "{dialog_text}"'
+                )
+
+        mismatched_fields = [
+            field
+            for field in fields
+            if field.verify
+            and win[field.control].window_text().strip() != field.value.strip()
+        ]
+        for field in mismatched_fields:
+            control = win[field.control]
+            control.set_edit_text("")
+            control.click_input()
+            control.type_keys(field.value, pause=0.1, with_spaces=True)
+            if field.trigger:
+                win.type_keys("{TAB}", pause=1)
+
+            if control.window_text().strip() != field.value.strip():
+                return (
+                    f"{REJECTION_PREFIX} Не удалось заполнить поле {field.control} "
+                    f'значением "{field.value}"'
+                )
+
+        return None
+
     def check_and_click(self, button: Button, target_button_name: str) -> None:
         mouse.move(coords=(button.x, button.y))
         status_bar = self.app.window(title_re="Банковская система.+")["StatusBar"]
@@ -340,6 +608,7 @@ class Colvir:
         x_offset = offset if horizontal else 0
         y_offset = offset if not horizontal else 0
 
+        is_debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         i = 0
         while status_win["StatusBar"].window_text().strip() != target_button_name:
             if point > end_point:
@@ -353,13 +622,19 @@ class Colvir:
                 y = point
 
             mouse.move(coords=(x, y))
+            if is_debug:
+                logging.debug("Scanning for %r at (%d, %d)", target_button_name, x, y)
             i += 1
+        logging.debug(
+            "Found %r at (%d, %d) after %d moves", target_button_name, x, y, i
+        )
 
         x += x_offset
         y += y_offset
 
         mouse.click(button="left", coords=(x, y))
 
+    @retry_step("find_and_click_button", check=raise_for_dialog)
     def find_and_click_button(
         self,
         button: Button,
@@ -390,6 +665,7 @@ class Colvir:
         x_offset = offset if horizontal else 0
         y_offset = offset if not horizontal else 0
 
+        is_debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         i = 0
         while status_win["StatusBar"].window_text().strip() != target_button_name:
             if point > end_point:
@@ -403,7 +679,12 @@ class Colvir:
                 y = point
 
             mouse.move(coords=(x, y))
+            if is_debug:
+                logging.debug("Scanning for %r at (%d, %d)", target_button_name, x, y)
             i += 1
+        logging.debug(
+            "Found %r at (%d, %d) after %d moves", target_button_name, x, y, i
+        )
 
         x += x_offset
         y += y_offset
@@ -412,12 +693,13 @@ class Colvir:
         button.y = y
         button.click()
 
-    def save_excel(self, work_folder: str) -> str:
+    def save_excel(self, work_folder: str, file_name: str = "orders") -> str:
         file_win = self.utils.get_window(title="Выберите файл для экспорта")
 
-        orders_file_path = os.path.join(work_folder, "orders.xls")
-        orders_xlsx_file_path = os.path.join(work_folder, "orders.xlsx")
+        orders_file_path = os.path.join(work_folder, f"{file_name}.xls")
+        orders_xlsx_file_path = os.path.join(work_folder, f"{file_name}.xlsx")
 
+        export_started = datetime.now().timestamp()
         file_win["Edit4"].set_text(orders_file_path)
         file_win["&Save"].click_input()
 
@@ -430,15 +712,36 @@ class Colvir:
         sort_win["OK"].click()
 
         while not os.path.exists(orders_file_path):
+            logging.debug("Waiting for %s", orders_file_path)
             sleep(5)
         sleep(1)
 
-        kill_all_processes("EXCEL")
+        self.close_export_excel(file_name=file_name, export_started=export_started)
 
-        xls_to_xlsx(orders_file_path, orders_xlsx_file_path)
+        excel_utils = lazy_import("src.utils.excel_utils")
+        excel_utils.xls_to_xlsx(orders_file_path, orders_xlsx_file_path)
 
         return orders_xlsx_file_path
 
+    def close_export_excel(self, file_name: str, export_started: float) -> None:
+        # Colvir usually opens the export in an Excel started through COM, which
+        # is not its child. Any other Excel is only touched if it was started
+        # after the export and shows exactly this file.
+        excel_pids = find_children(self.app.process, "EXCEL")
+        if not excel_pids:
+            title_re = re.compile(rf"(^|[\s-]){re.escape(file_name)}\.xls(\s|$)")
+            excel_pids = {
+                pid
+                for pid in find_window_pids(class_name="XLMAIN", title_re=title_re)
+                if is_started_after(pid, export_started)
+            }
+        if not excel_pids:
+            excel_pids = find_processes("EXCEL", started_after=export_started)
+
+        for pid in excel_pids:
+            registry.register("EXCEL", pid)
+        registry.terminate("EXCEL", pids=excel_pids)
+
     def change_oper_day(self, start_date: Date):
         self.choose_mode(mode="TOPERD")
         current_oper_day_win = self.utils.get_window(title="Текущий операционный день")
@@ -456,10 +759,7 @@ class Colvir:
         sleep(0.5)
         self.utils.close_dialog()
 
-    def find_employee(
-        self,
-        employee_names: Tuple[str, str],
-    ) -> bool:
+    def open_personnel_filter(self) -> pywinauto.WindowSpecification:
         self.choose_mode(mode="PRS")
         filter_win = self.utils.get_window(title="Фильтр")
         self.find_and_click_button(
@@ -470,6 +770,55 @@ class Colvir:
         )
 
         filter_win["Edit8"].set_text("001")
+        return filter_win
+
+    def load_personnel(self, work_folder: str) -> PersonnelTable:
+        filter_win = self.open_personnel_filter()
+        filter_win["OK"].click()
+        sleep(1)
+
+        personal_win = self.utils.get_window(title="Персонал")
+        personal_win.menu_select("#4->#4->#1")
+        personnel_file_path = self.save_excel(
+            work_folder=work_folder, file_name="personnel"
+        )
+        personal_win.close()
+
+        personnel_export = lazy_import("src.utils.personnel_export")
+        self.personnel = PersonnelTable(
+            personnel_export.load_personnel(personnel_file_path)
+        )
+        return self.personnel
+
+    def load_order_journal(
+        self, work_folder: str, mode: str, max_age: float
+    ) -> order_export.OrderJournal:
+        self.choose_mode(mode=mode)
+        sleep(1)
+
+        journal_win = self.app.top_window()
+        journal_win.menu_select("#4->#4->#1")
+        journal_file_path = self.save_excel(
+            work_folder=work_folder, file_name="order_journal"
+        )
+        journal_win.close()
+
+        self.order_journal = order_export.load_order_journal(
+            journal_file_path, max_age=max_age
+        )
+        return self.order_journal
+
+    def remember_order(self, process: Process, order: Order) -> None:
+        if self.order_journal is not None:
+            self.order_journal.add(
+                process.order_type, order.order_number, " ".join(order.employee_names)
+            )
+
+    def find_employee(
+        self,
+        employee_names: Tuple[str, str],
+    ) -> bool:
+        filter_win = self.open_personnel_filter()
         filter_win["Edit4"].set_text(employee_names[0])
         filter_win["Edit2"].set_text(employee_names[1])
         filter_win["OK"].click()
@@ -490,43 +839,30 @@ class Colvir:
     def does_order_exist(
         orders_file_path: str, order_type: str, order_number: str
     ) -> bool:
-        df = pd.read_excel(orders_file_path, skiprows=1)
-
-        order_exists = (
-            (df["Вид приказа"] == order_type) & (df["Номер приказа"] == order_number)
-        ).any()
-
-        return order_exists
+        return order_export.does_order_exist(
+            orders_file_path=orders_file_path,
+            order_type=order_type,
+            order_number=order_number,
+        )
 
     def process_employee_order_status(self, process: Process, order: Order) -> Tuple[
         Optional[pywinauto.WindowSpecification],
         Optional[pywinauto.WindowSpecification],
         Optional[str],
     ]:
-        match order:
-            case BusinessTripOrder():
-                order = cast(BusinessTripOrder, order)
-                start_date = order.start_date
-            case VacationOrder():
-                order = cast(VacationOrder, order)
-                start_date = order.start_date
-            case VacationWithdrawOrder():
-                order = cast(VacationWithdrawOrder, order)
-                start_date = order.withdraw_date
-            case FiringOrder():
-                order = cast(FiringOrder, order)
-                start_date = order.firing_date
-            case MentorshipOrder():
-                order = cast(MentorshipOrder, order)
-                start_date = order.creation_date
-            case VacationAddPayOrder():
-                order = cast(VacationAddPayOrder, order)
-                # FIXME: fix
-                start_date = order.date
-            case _:
-                raise ValueError(f"Order is of unknown type - {type(order)}")
-
-        self.change_oper_day(start_date=start_date)
+        order_exists = None
+        if self.order_journal is not None:
+            order_exists = self.order_journal.check(
+                process.order_type, order.order_number, " ".join(order.employee_names)
+            )
+            if order_exists:
+                return None, None, "Приказ уже создан"
+
+        start_date = get_order_date(order)
+        if self.oper_day != start_date.dt.date():
+            self.change_oper_day(start_date=start_date)
+            self.oper_day = start_date.dt.date()
+
         if not self.find_employee(employee_names=order.employee_names):
             return None, None, "Приказ не найден"
 
@@ -539,42 +875,81 @@ class Colvir:
         )
 
         orders_win = self.utils.get_window(title="Приказы сотрудника")
-        orders_win.menu_select("#4->#4->#1")
+        if order_exists is None:
+            orders_win.menu_select("#4->#4->#1")
+            order_exists = self.does_order_exist(
+                orders_file_path=self.save_excel(work_folder=process.report_folder),
+                order_type=process.order_type,
+                order_number=order.order_number,
+            )
 
-        if self.does_order_exist(
-            orders_file_path=self.save_excel(work_folder=process.report_folder),
-            order_type=process.order_type,
-            order_number=order.order_number,
-        ):
+        if order_exists:
             orders_win.close()
             personal_win.close()
             return None, None, "Приказ уже создан"
 
+        return personal_win, orders_win, None
+
+    @staticmethod
+    def read_card_fullname(
+        employee_card: pywinauto.WindowSpecification, surname: str
+    ) -> str:
+        # the card shows the name as Colvir stores it, the filter matched the surname
+        surname = normalize_name(surname)
+        for edit in employee_card.children(class_name="Edit"):
+            fullname = clean_name(edit.window_text())
+            if normalize_name(fullname).startswith(f"{surname} "):
+                return fullname
+        return ""
+
+    def read_employee_card(self, employee_names: Tuple[str, str]) -> EmployeeRecord:
+        personal_win = self.utils.get_window(title="Персонал")
         personal_win.set_focus()
         sleep(1)
         personal_win.type_keys("{ENTER}")
 
-        return personal_win, orders_win, None
+        employee_card = self.utils.get_window(title="Карточка сотрудника")
+        record = EmployeeRecord(
+            branch_num=employee_card["Edit60"].window_text(),
+            tab_num=employee_card["Edit34"].window_text(),
+            status=employee_card["Edit30"].window_text().strip(),
+            fullname=self.read_card_fullname(employee_card, employee_names[0]),
+        )
+        employee_card.close()
+        return record
 
     def process_employee_card(self, order: Order) -> Optional[str]:
-        employee_card = self.utils.get_window(title="Карточка сотрудника")
-        order.employee_status = employee_card["Edit30"].window_text().strip()
-        print(order.employee_fullname, order.employee_status)
+        record = None
+        if self.personnel is not None:
+            record = self.personnel.find(order.employee_fullname)
+        if record is None and self.employee_cache is not None:
+            record = self.employee_cache.get(order.employee_fullname)
+
+        if record is None:
+            record = self.read_employee_card(employee_names=order.employee_names)
+            if self.employee_cache is not None:
+                self.employee_cache.put(order.employee_fullname, record)
+
+        order.employee_status = record.status
+        logging.info(f"Employee status: {order.employee_status}")
 
         if order.employee_status == "Уволен":
-            employee_card.close()
             return (
                 f"Невозможно создать приказ для сотрудника "
                 f'со статусом "{order.employee_status}"'
             )
 
-        order.branch_num = employee_card["Edit60"].window_text()
-        order.tab_num = employee_card["Edit34"].window_text()
-
-        employee_card.close()
+        order.branch_num = record.branch_num
+        order.tab_num = record.tab_num
 
         return None
 
+    def forget_employee(self, order: Order) -> None:
+        if self.personnel is not None:
+            self.personnel.forget(order.employee_fullname)
+        if self.employee_cache is not None:
+            self.employee_cache.invalidate(order.employee_fullname)
+
     def return_from(
         self, target_button_name: str, personal_win: pywinauto.WindowSpecification
     ) -> None:
@@ -617,7 +992,7 @@ class Colvir:
         popup_menu = self.app.PopupMenu
 
         if not popup_menu.exists():
-            raise Exception('Menu "Выполнить операцию" was not clicked')
+            raise TransientError('Menu "Выполнить операцию" was not clicked')
 
         self.find_and_click_button_temp(
             window=orders_win,
@@ -679,9 +1054,18 @@ class Colvir:
         return None
 
     def __enter__(self) -> "Colvir":
-        self.open_colvir()
+        if self.session_path is not None:
+            with open(self.busy_path, "w", encoding="utf-8") as f:
+                f.write(str(os.getpid()))
+        self.ensure_session()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if not self.app.kill():
-            kill_all_processes("COLVIR")
+        logging.info(f"Window cache statistics:\n{self.utils.window_cache_summary()}")
+        if self.session_path is not None:
+            if os.path.exists(self.busy_path):
+                os.remove(self.busy_path)
+            return
+        if self.app is not None:
+            self.app.kill()
+        registry.terminate("COLVIR")
@@ -0,0 +1,96 @@
+from typing import Callable, List, Optional, Tuple, Union
+
+from attr import define
+
+
+@define
+class DialogContent:
+    title: Optional[str]
+    content: Optional[str]
+    button_names: List[str]
+
+    def __getitem__(self, item: str):
+        return getattr(self, item)
+
+    def __setitem__(self, key: str, value: Union[Optional[str], List[str]]):
+        setattr(self, key, value)
+
+
+def parse_dialog_content(dialog_text: str) -> DialogContent:
+    lines = list(filter(lambda l: l, dialog_text.split("\r\n")))
+
+    dialog_content = DialogContent(title=None, content=None, button_names=[])
+
+    section = None
+    for line in lines:
+        if line.startswith("[Window Title]"):
+            section = "title"
+        elif line.startswith("[Content]"):
+            section = "content"
+        elif (
+            line.startswith("[OK]")
+            or line.startswith("[Cancel]")
+            or line.startswith("[")
+        ):
+            dialog_content.button_names.append(line.strip("[]"))
+        else:
+            if section:
+                dialog_content[section] = line
+                section = None
+
+    return dialog_content
+
+
+TEXT_CONTROL_TYPES = {"Static", "Text"}
+
+
+def parse_dialog_controls(
+    title: str, controls: List[Tuple[str, str]]
+) -> DialogContent:
+    texts = [
+        text.strip()
+        for control_type, text in controls
+        if control_type in TEXT_CONTROL_TYPES
+    ]
+    button_names = [
+        text.replace("&", "")
+        for control_type, text in controls
+        if control_type == "Button"
+    ]
+    content = " ".join(text for text in texts if text)
+    return DialogContent(
+        title=title, content=content or None, button_names=button_names
+    )
+
+
+class DialogInspector:
+    def __init__(
+        self,
+        title: str,
+        find_window: Callable[[str], int],
+        read_controls: Callable[[int], List[Tuple[str, str]]],
+        read_clipboard: Callable[[int], str],
+    ) -> None:
+        self.title = title
+        self.find_window = find_window
+        self.read_controls = read_controls
+        self.read_clipboard = read_clipboard
+
+    def inspect(self) -> Optional[Tuple[int, DialogContent]]:
+        handle = self.find_window(self.title)
+        if not handle:
+            return None
+
+        try:
+            dialog_content = parse_dialog_controls(
+                title=self.title, controls=self.read_controls(handle)
+            )
+        except Exception:
+            dialog_content = DialogContent(
+                title=self.title, content=None, button_names=[]
+            )
+
+        if dialog_content.content is None:
+            dialog_content = parse_dialog_content(self.read_clipboard(handle))
+
+        return handle, dialog_content
@@ -1,27 +1,22 @@
 import os
 from contextlib import contextmanager
 
-import psutil
 import win32com.client as win32
+import win32process
 
-
-def kill_all_processes(proc_name: str) -> None:
-    for proc in psutil.process_iter():
-        try:
-            if proc_name in proc.name():
-                proc.terminate()
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            continue
+from src.utils.process_utils import registry
 
 
 @contextmanager
 def dispatch(application: str) -> None:
-    app = win32.Dispatch(application)
+    app = win32.DispatchEx(application)
     app.DisplayAlerts = False
+    _, pid = win32process.GetWindowThreadProcessId(app.Hwnd)
+    registry.register("EXCEL", pid)
     try:
         yield app
     finally:
-        kill_all_processes(proc_name="EXCEL")
+        registry.terminate("EXCEL", pids={pid})
 
 
 @contextmanager
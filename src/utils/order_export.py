@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.names import normalize_name
+
+JOURNAL_EMPLOYEE_COLUMN = "Сотрудник"
+
+
+def does_order_exist(orders_file_path: str, order_type: str, order_number: str) -> bool:
+    df = pd.read_excel(orders_file_path, skiprows=1)
+
+    order_exists = (
+        (df["Вид приказа"] == order_type) & (df["Номер приказа"] == order_number)
+    ).any()
+
+    return bool(order_exists)
+
+
+class OrderJournal:
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self.exported_at = time.time()
+        self.employees: Dict[Tuple[str, str], Set[str]] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    def add(self, order_type: str, order_number: str, employee_fullname: str) -> None:
+        with self.lock:
+            self.employees.setdefault(
+                (order_type.strip(), order_number.strip()), set()
+            ).add(normalize_name(employee_fullname))
+
+    def check(
+        self, order_type: str, order_number: str, employee_fullname: str
+    ) -> Optional[bool]:
+        if time.time() - self.exported_at > self.max_age:
+            return None
+
+        employees = self.employees.get((order_type.strip(), order_number.strip()))
+        if not employees:
+            return False
+        if normalize_name(employee_fullname) in employees:
+            return True
+        return None
+
+
+def load_order_journal(journal_file_path: str, max_age: float) -> OrderJournal:
+    df = pd.read_excel(journal_file_path, skiprows=1, dtype=str)
+    df = df.dropna(subset=["Вид приказа", "Номер приказа", JOURNAL_EMPLOYEE_COLUMN])
+
+    journal = OrderJournal(max_age=max_age)
+    for order_type, order_number, employee_fullname in zip(
+        df["Вид приказа"], df["Номер приказа"], df[JOURNAL_EMPLOYEE_COLUMN]
+    ):
+        journal.add(order_type, order_number, employee_fullname)
+    return journal
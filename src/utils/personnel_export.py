@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List
+
+import pandas as pd
+
+from src.employee_cache import EmployeeRecord
+
+PERSONNEL_COLUMNS = {
+    "ФИО": "fullname",
+    "Таб.номер": "tab_num",
+    "Подразделение": "branch_num",
+    "Состояние": "status",
+}
+
+
+def load_personnel(personnel_file_path: str) -> List[EmployeeRecord]:
+    df = pd.read_excel(personnel_file_path, skiprows=1, dtype=str)
+    df = df.rename(columns=PERSONNEL_COLUMNS)[list(PERSONNEL_COLUMNS.values())]
+    df = df.dropna(subset=["fullname", "tab_num"]).fillna("")
+
+    updated_at = datetime.now().isoformat(timespec="seconds")
+    return [
+        EmployeeRecord(
+            branch_num=row.branch_num.strip(),
+            tab_num=row.tab_num.strip(),
+            status=row.status.strip(),
+            updated_at=updated_at,
+            fullname=" ".join(row.fullname.split()),
+        )
+        for row in df.itertuples(index=False)
+    ]
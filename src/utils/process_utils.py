@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set
+
+import psutil
+
+
+def is_pid_running(pid: int) -> bool:
+    return psutil.pid_exists(pid)
+
+
+def find_children(parent_pid: int, proc_name: str) -> Set[int]:
+    try:
+        children = psutil.Process(parent_pid).children(recursive=True)
+    except (psutil.AccessDenied, psutil.NoSuchProcess):
+        return set()
+
+    pids: Set[int] = set()
+    for proc in children:
+        try:
+            if proc_name in proc.name():
+                pids.add(proc.pid)
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            continue
+    return pids
+
+
+def is_started_after(pid: int, timestamp: float) -> bool:
+    try:
+        return psutil.Process(pid).create_time() >= timestamp
+    except (psutil.AccessDenied, psutil.NoSuchProcess):
+        return False
+
+
+def find_processes(proc_name: str, started_after: float) -> Set[int]:
+    return {
+        proc.pid
+        for proc in psutil.process_iter(attrs=["name"])
+        if proc_name in (proc.info["name"] or "")
+        and is_started_after(proc.pid, started_after)
+    }
+
+
+def terminate_processes(processes: List[psutil.Process]) -> None:
+    for proc in processes:
+        try:
+            proc.terminate()
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            continue
+
+    _, alive = psutil.wait_procs(processes, timeout=3)
+    for proc in alive:
+        try:
+            proc.kill()
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            continue
+
+
+class ProcessEntry(NamedTuple):
+    create_time: float
+    owner: int
+
+
+class ProcessRegistry:
+    def __init__(self) -> None:
+        self.pids: Dict[str, Dict[int, ProcessEntry]] = {}
+        self.state_path: Optional[str] = None
+        self.lock = threading.Lock()
+
+    def load(self, state_path: str) -> None:
+        with self.lock:
+            self.state_path = state_path
+            self.read()
+
+    def read(self) -> None:
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            self.pids = {
+                proc_name: {
+                    int(pid): ProcessEntry(*entry) for pid, entry in pids.items()
+                }
+                for proc_name, pids in json.load(f).items()
+            }
+
+    def save(self) -> None:
+        if self.state_path is None:
+            return
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.pids, f)
+        os.replace(tmp_path, self.state_path)
+
+    def register(self, proc_name: str, pid: int) -> None:
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            return
+
+        with self.lock:
+            self.read()
+            registered = self.pids.setdefault(proc_name, {})
+            entry = registered.get(pid)
+            if entry is None or entry.create_time != create_time:
+                registered[pid] = ProcessEntry(create_time, os.getpid())
+                self.save()
+        logging.info(f"Registered {proc_name} process {pid}")
+
+    @staticmethod
+    def is_owned_or_orphaned(entry: ProcessEntry) -> bool:
+        return entry.owner == os.getpid() or not is_pid_running(entry.owner)
+
+    def pop_processes(
+        self, proc_name: str, pids: Optional[Set[int]] = None
+    ) -> List[psutil.Process]:
+        with self.lock:
+            self.read()
+            registered = self.pids.get(proc_name, {})
+            popped = {
+                pid: registered.pop(pid)
+                for pid, entry in list(registered.items())
+                if (self.is_owned_or_orphaned(entry) if pids is None else pid in pids)
+            }
+            self.save()
+
+        processes: List[psutil.Process] = []
+        for pid, entry in popped.items():
+            try:
+                proc = psutil.Process(pid)
+                if proc_name in proc.name() and proc.create_time() == entry.create_time:
+                    processes.append(proc)
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                continue
+        return processes
+
+    def terminate(self, proc_name: str, pids: Optional[Set[int]] = None) -> None:
+        terminate_processes(self.pop_processes(proc_name, pids=pids))
+
+
+registry = ProcessRegistry()
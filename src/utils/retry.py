@@ -0,0 +1,116 @@
+import logging
+import time
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from src.metrics import metrics
+
+
+class FailureKind(Enum):
+    TRANSIENT = "transient"
+    MISSING_WINDOW = "missing_window"
+    BUSINESS = "business"
+    FATAL = "fatal"
+
+
+class BusinessError(Exception):
+    pass
+
+
+class TransientError(Exception):
+    pass
+
+
+class RetryPolicy(NamedTuple):
+    attempts: int
+    backoff: float = 0.5
+    max_backoff: float = 4.0
+
+    def get_delay(self, attempt: int) -> float:
+        return min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+
+
+RETRY_POLICIES: Dict[FailureKind, RetryPolicy] = {
+    FailureKind.TRANSIENT: RetryPolicy(attempts=4, backoff=0.5, max_backoff=4.0),
+    FailureKind.MISSING_WINDOW: RetryPolicy(attempts=3, backoff=1.0, max_backoff=4.0),
+    FailureKind.BUSINESS: RetryPolicy(attempts=1),
+    FailureKind.FATAL: RetryPolicy(attempts=1),
+}
+
+TRANSIENT_ERRORS = {
+    "TimeoutError",
+    "ElementNotEnabled",
+    "ElementNotVisible",
+    "ElementNotActive",
+    "com_error",
+}
+MISSING_WINDOW_ERRORS = {
+    "ElementNotFoundError",
+    "ElementAmbiguousError",
+    "WindowNotFoundError",
+    "MatchError",
+}
+
+
+def classify_failure(error: BaseException) -> FailureKind:
+    if isinstance(error, BusinessError):
+        return FailureKind.BUSINESS
+    if isinstance(error, TransientError):
+        return FailureKind.TRANSIENT
+    if not isinstance(error, Exception):
+        return FailureKind.FATAL
+
+    error_names = {error_t.__name__ for error_t in type(error).__mro__}
+    if error_names & MISSING_WINDOW_ERRORS:
+        return FailureKind.MISSING_WINDOW
+    if error_names & TRANSIENT_ERRORS:
+        return FailureKind.TRANSIENT
+    return FailureKind.FATAL
+
+
+def run_step(
+    step: str,
+    func: Callable[[], Any],
+    policies: Dict[FailureKind, RetryPolicy] = RETRY_POLICIES,
+    sleep: Callable[[float], None] = time.sleep,
+    check: Optional[Callable[[], None]] = None,
+) -> Any:
+    attempt = 1
+    while True:
+        try:
+            return func()
+        except Exception as error:
+            if check is not None:
+                check()
+            kind = classify_failure(error)
+            policy = policies[kind]
+            if attempt >= policy.attempts:
+                raise
+
+            metrics.inc("colvir_step_retries_total", step=step, kind=kind.value)
+            delay = policy.get_delay(attempt)
+            logging.warning(
+                f"Step {step} failed ({kind.value}, attempt {attempt}/"
+                f"{policy.attempts}), retrying in {delay:.1f}s: {error!r}"
+            )
+            sleep(delay)
+            attempt += 1
+
+
+def retry_step(
+    step: str, check: Optional[Callable[[Any], None]] = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs) -> Any:
+            with metrics.timer("colvir_step_seconds", step=step):
+                return run_step(
+                    step=step,
+                    func=lambda: func(self, *args, **kwargs),
+                    check=None if check is None else lambda: check(self),
+                )
+
+        return wrapper
+
+    return decorator
@@ -1,12 +1,14 @@
+import logging
 import os
 from time import sleep
+from typing import TYPE_CHECKING, List, Tuple
 
 import pandas as pd
-from pywinauto import mouse
-from pywinauto.win32structures import RECT
 
 from src.data import Order, Process, BusinessTripOrder
-from src.utils.colvir_utils import Colvir
+
+if TYPE_CHECKING:
+    from src.utils.colvir_utils import Colvir
 
 
 def create_report(report_file_path: str):
@@ -29,32 +31,55 @@ def update_report(
     operation: str,
     status: str,
 ):
+    update_reports(process=process, results=[(order, operation, status)])
+
+
+def update_reports(
+    process: Process,
+    results: List[Tuple[Order, str, str]],
+):
+    if not results:
+        return
+
     df = pd.read_excel(process.report_path)
 
-    if not (
-        (df["Дата"] == process.today)
-        & (df["Сотрудник"] == order.employee_fullname)
-        & (df["Операция"] == operation)
-        & (df["Номер приказа"] == order.order_number)
-    ).any():
+    is_updated = False
+    for order, operation, status in results:
+        employee_fullname = getattr(order, "employee_fullname", None)
+        order_number = getattr(order, "order_number", None)
+
+        if (
+            (df["Дата"] == process.today)
+            & (df["Сотрудник"] == employee_fullname)
+            & (df["Операция"] == operation)
+            & (df["Номер приказа"] == order_number)
+        ).any():
+            continue
+
         new_row = {
             "Дата": process.today,
-            "Сотрудник": order.employee_fullname,
+            "Сотрудник": employee_fullname,
             "Операция": operation,
-            "Номер приказа": order.order_number,
+            "Номер приказа": order_number,
             "Статус": status,
         }
         df.loc[len(df)] = new_row
+        is_updated = True
+
+    if is_updated:
         df.to_excel(process.report_path, index=False)
 
 
-def get_city_mappings(colvir: Colvir, order: BusinessTripOrder) -> None:
+def get_city_mappings(colvir: "Colvir", order: BusinessTripOrder) -> None:
     """
     Тестовая функция для сбора маппингов
     :param colvir: Colvir
     :param order: BusinessTripOrder
     :return: None
     """
+    from pywinauto import mouse
+    from pywinauto.win32structures import RECT
+
     colvir.choose_mode(mode="PRS")
     filter_win = colvir.utils.get_window(title="Фильтр")
     colvir.find_and_click_button(
@@ -159,11 +184,7 @@ def get_city_mappings(colvir: Colvir, order: BusinessTripOrder) -> None:
         colvir_name = order_win["Edit28"].window_text().strip()
         mappings[fullname] = colvir_name
 
-        print(
-            order_win["Edit28"].window_text().strip(),
-            "&&",
-            order_win["Edit18"].window_text().strip(),
-        )
+        logging.info(f"City mapping: {colvir_name} && {fullname}")
 
         i += 1
 
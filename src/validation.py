@@ -0,0 +1,161 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type
+
+from src.data import (
+    Date,
+    Order,
+    BusinessTripOrder,
+    VacationOrder,
+    VacationWithdrawOrder,
+    FiringOrder,
+    MentorshipOrder,
+    VacationAddPayOrder,
+)
+
+REJECTION_PREFIX = "Не удалось заполнить приказ. Требуется проверка специалистом."
+
+
+class Rule(NamedTuple):
+    is_valid: Callable[[Order], bool]
+    reason: Callable[[Order], str]
+
+
+def has_text(value: Any) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def has_names(value: Any) -> bool:
+    return (
+        isinstance(value, (list, tuple))
+        and len(value) >= 2
+        and all(has_text(name) for name in value)
+    )
+
+
+def required_text(attr: str, description: str) -> Rule:
+    return Rule(
+        is_valid=lambda order: has_text(getattr(order, attr, None)),
+        reason=lambda order: f"Не заполнено поле - {description}",
+    )
+
+
+def required_names(attr: str, description: str) -> Rule:
+    return Rule(
+        is_valid=lambda order: has_names(getattr(order, attr, None)),
+        reason=lambda order: (
+            f"Не удалось разобрать ФИО - {description} "
+            f'"{getattr(order, attr.replace("_names", "_fullname"), None)}"'
+        ),
+    )
+
+
+def optional_names(attr: str, description: str) -> Rule:
+    fullname_attr = attr.replace("_names", "_fullname")
+    return Rule(
+        is_valid=lambda order: (
+            not has_text(getattr(order, fullname_attr, None))
+            or has_names(getattr(order, attr, None))
+        ),
+        reason=lambda order: (
+            f"Не удалось разобрать ФИО - {description} "
+            f'"{getattr(order, fullname_attr, None)}"'
+        ),
+    )
+
+
+def required_date(attr: str, description: str) -> Rule:
+    return Rule(
+        is_valid=lambda order: isinstance(getattr(order, attr, None), Date),
+        reason=lambda order: (
+            f"Некорректная дата - {description} "
+            f'"{getattr(order, attr, None)}"'
+        ),
+    )
+
+
+def date_range(start_attr: str, end_attr: str) -> Rule:
+    def is_valid(order: Order) -> bool:
+        start_date: Optional[Date] = getattr(order, start_attr, None)
+        end_date: Optional[Date] = getattr(order, end_attr, None)
+        if start_date is None or end_date is None:
+            return True
+        return start_date.dt <= end_date.dt
+
+    return Rule(
+        is_valid=is_valid,
+        reason=lambda order: (
+            f"Дата начала {getattr(order, start_attr).short} позже "
+            f"даты окончания {getattr(order, end_attr).short}"
+        ),
+    )
+
+
+EMPLOYEE_RULES = [
+    required_text("employee_fullname", "ФИО сотрудника"),
+    required_names("employee_names", "сотрудник"),
+    required_text("order_number", "номер приказа"),
+]
+
+RULES: Dict[Type[Order], List[Rule]] = {
+    BusinessTripOrder: EMPLOYEE_RULES
+    + [
+        required_date("sign_date", "дата подписания"),
+        required_date("start_date", "дата начала"),
+        required_date("end_date", "дата окончания"),
+        date_range("start_date", "end_date"),
+        Rule(
+            is_valid=lambda order: has_text(order.trip_code),
+            reason=lambda order: (
+                f"Неизвестный город/местоположение - {order.trip_place}"
+            ),
+        ),
+        optional_names("deputy_names", "замещающий сотрудник"),
+    ],
+    VacationOrder: EMPLOYEE_RULES
+    + [
+        required_date("start_date", "дата начала"),
+        required_date("end_date", "дата окончания"),
+        date_range("start_date", "end_date"),
+        optional_names("deputy_names", "замещающий сотрудник"),
+    ],
+    VacationWithdrawOrder: EMPLOYEE_RULES
+    + [
+        required_date("withdraw_date", "дата отзыва"),
+    ],
+    FiringOrder: EMPLOYEE_RULES
+    + [
+        required_date("firing_date", "дата увольнения"),
+    ],
+    MentorshipOrder: EMPLOYEE_RULES
+    + [
+        required_names("mentor_names", "ментор"),
+        required_date("work_start_date", "первый рабочий день"),
+        required_date("contract_start_date", "начало договора"),
+        required_date("mentorship_start_date", "начало менторства"),
+        required_date("creation_date", "дата создания"),
+        date_range("mentorship_start_date", "mentorship_end_date"),
+    ],
+    VacationAddPayOrder: EMPLOYEE_RULES
+    + [
+        required_date("date", "дата приказа"),
+    ],
+}
+
+
+def get_rejection_reasons(orders: List[Order]) -> List[Optional[str]]:
+    reasons: List[Optional[str]] = [None] * len(orders)
+
+    orders_by_type: Dict[Type[Order], List[int]] = {}
+    for idx, order in enumerate(orders):
+        orders_by_type.setdefault(type(order), []).append(idx)
+
+    for order_t, indices in orders_by_type.items():
+        for rule in RULES[order_t]:
+            pending = [idx for idx in indices if reasons[idx] is None]
+            if not pending:
+                break
+            for idx in pending:
+                if not rule.is_valid(orders[idx]):
+                    reasons[idx] = f"{REJECTION_PREFIX} {rule.reason(orders[idx])}"
+
+    return reasons
+